@@ -0,0 +1,60 @@
+import os
+import threading
+
+import pygame
+
+from rendering import SpriteAtlas, load_animation_frames
+
+SOUND_NAMES = ('click', 'step', 'hit')
+MUSIC_NAME = 'background_music'
+
+class AssetManager:
+    # Images and sounds load on a background thread so the menu can be shown immediately;
+    # the music stream is only opened the first time it is played.
+    def __init__(self, root, animations):
+        self.root = root
+        self.animations = animations
+        self.loaded = threading.Event()
+        self.frames = {}
+        self.sounds = {}
+        self.music_path = None
+        self.music_loaded = False
+        self.audio_available = None
+        self.sprite_atlas = None
+        self.thread = threading.Thread(target=self.load, name="asset-loader", daemon=True)
+    def start(self):
+        self.thread.start()
+    def load(self):
+        try:
+            self.frames = load_animation_frames(os.path.join(self.root, 'images'), self.animations)
+            self.sounds = self.load_sounds()
+            self.music_path = self.find_music()
+        finally:
+            self.audio_available = len(self.sounds) == len(SOUND_NAMES) and self.music_path is not None
+            self.loaded.set()
+    def load_sounds(self):
+        if pygame.mixer.get_init() is None:
+            return {}
+        sounds = {}
+        for name in SOUND_NAMES:
+            try:
+                sounds[name] = pygame.mixer.Sound(os.path.join(self.root, 'sounds', name + '.wav'))
+            except (pygame.error, FileNotFoundError):
+                pass
+        return sounds
+    def find_music(self):
+        for directory in ('music', 'sounds'):
+            path = os.path.join(self.root, directory, MUSIC_NAME + '.mp3')
+            if os.path.exists(path):
+                return path
+        return None
+    def atlas(self):
+        if self.sprite_atlas is None:
+            self.loaded.wait()
+            self.sprite_atlas = SpriteAtlas(self.frames)
+        return self.sprite_atlas
+    def play_music(self):
+        if not self.music_loaded:
+            pygame.mixer.music.load(self.music_path)
+            self.music_loaded = True
+        pygame.mixer.music.play(-1)
@@ -0,0 +1,65 @@
+import pygame
+
+CHANNEL_COUNT = 8
+MIN_INTERVALS = {"step": 0.08, "hit": 0.25, "click": 0.05}
+DEFAULT_INTERVAL = 0.05
+MUSIC_CHECK_INTERVAL = 1.0
+
+class AudioScheduler:
+    # Sounds requested during a frame are collected and played once per frame, on a fixed pool of
+    # mixer channels. Each sound plays at most once per flush, and not again until its minimum
+    # interval has passed, so a burst of identical events costs one play. The music callback runs
+    # on a timer instead of every frame.
+    def __init__(self, check_music, channel_count=CHANNEL_COUNT, intervals=MIN_INTERVALS, music_interval=MUSIC_CHECK_INTERVAL):
+        self.check_music = check_music
+        self.channel_count = channel_count
+        self.intervals = intervals
+        self.music_interval = music_interval
+        self.sounds = None
+        self.channels = []
+        self.next_channel = 0
+        self.pending = {}
+        self.last_played = {}
+        self.clock = 0.0
+        self.music_timer = 0.0
+
+    def attach(self, sounds):
+        self.sounds = dict(sounds)
+        if self.sounds and pygame.mixer.get_init() is not None:
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), self.channel_count))
+            self.channels = [pygame.mixer.Channel(index) for index in range(self.channel_count)]
+
+    def request(self, name):
+        self.pending[name] = True
+
+    def update(self, dt):
+        self.clock += dt
+        if self.pending:
+            self.flush()
+        self.music_timer -= dt
+        if self.music_timer <= 0.0:
+            self.music_timer = self.music_interval
+            self.check_music()
+
+    def flush(self):
+        pending = self.pending
+        self.pending = {}
+        if not self.channels:
+            return
+        for name in pending:
+            sound = self.sounds.get(name)
+            if sound is None or self.clock - self.last_played.get(name, -1e9) < self.intervals.get(name, DEFAULT_INTERVAL):
+                continue
+            self.last_played[name] = self.clock
+            self.channel().play(sound)
+
+    def channel(self):
+        # The first idle channel after the last one used, or the oldest one if all are busy.
+        for offset in range(self.channel_count):
+            index = (self.next_channel + offset) % self.channel_count
+            if not self.channels[index].get_busy():
+                break
+        else:
+            index = self.next_channel
+        self.next_channel = (index + 1) % self.channel_count
+        return self.channels[index]
@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from assets import SOUND_NAMES
+from audio import AudioScheduler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BURSTS = [1, 10, 100, 1000]
+FRAMES = 120
+FRAME_TIME = 1 / 60
+
+def load_sounds():
+    return {name: pygame.mixer.Sound(os.path.join(ROOT, "sounds", name + ".wav")) for name in SOUND_NAMES}
+
+def play_directly(sounds, events):
+    # The previous behaviour: every event looks its sound up and plays it straight away.
+    for name in events:
+        sound = sounds.get(name)
+        if sound is not None:
+            sound.play()
+
+def main():
+    pygame.mixer.init()
+    sounds = load_sounds()
+    print(f"{'events/frame':>13} {'direct ms':>10} {'scheduled ms':>13} {'plays/frame':>12}")
+    for burst in BURSTS:
+        events = [SOUND_NAMES[index % len(SOUND_NAMES)] for index in range(burst)]
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            play_directly(sounds, events)
+        direct_ms = (time.perf_counter() - start) / FRAMES * 1000
+        pygame.mixer.stop()
+        scheduler = AudioScheduler(lambda: None)
+        scheduler.attach(sounds)
+        plays = 0
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            for name in events:
+                scheduler.request(name)
+            before = dict(scheduler.last_played)
+            scheduler.update(FRAME_TIME)
+            plays += sum(scheduler.last_played.get(name) != before.get(name) for name in scheduler.last_played)
+        scheduled_ms = (time.perf_counter() - start) / FRAMES * 1000
+        pygame.mixer.stop()
+        print(f"{burst:>13} {direct_ms:>10.3f} {scheduled_ms:>13.3f} {plays / FRAMES:>12.2f}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
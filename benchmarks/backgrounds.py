@@ -0,0 +1,48 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from rendering import BackgroundCache, draw_text, render_gradient
+
+WIDTH, HEIGHT = 800, 600
+FRAMES = 60
+
+def draw_menu_per_line(surface):
+    for y in range(HEIGHT):
+        color_intensity = int(30 + (y / HEIGHT) * 20)
+        pygame.draw.rect(surface, (color_intensity, color_intensity, color_intensity + 20), pygame.Rect(0, y, WIDTH, 1))
+    draw_text(surface, "DUNGEON EXPLORER", center=(WIDTH // 2 + 2, 148), fontsize=48, color=(100, 100, 150))
+    draw_text(surface, "DUNGEON EXPLORER", center=(WIDTH // 2, 150), fontsize=48, color=(255, 255, 255))
+    draw_text(surface, "Find the Golden Exit to Win!", center=(WIDTH // 2, 200), fontsize=24, color=(255, 215, 0))
+
+def build_menu_background(size):
+    background = render_gradient(size, 30, 20, (0, 0, 20))
+    draw_text(background, "DUNGEON EXPLORER", center=(size[0] // 2 + 2, 148), fontsize=48, color=(100, 100, 150))
+    draw_text(background, "DUNGEON EXPLORER", center=(size[0] // 2, 150), fontsize=48, color=(255, 255, 255))
+    draw_text(background, "Find the Golden Exit to Win!", center=(size[0] // 2, 200), fontsize=24, color=(255, 215, 0))
+    return background
+
+def time_frames(draw_frame):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        draw_frame()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+def main():
+    pygame.init()
+    surface = pygame.display.set_mode((WIDTH, HEIGHT))
+    cache = BackgroundCache({"menu": build_menu_background})
+    start = time.perf_counter()
+    cache.get("menu", (WIDTH, HEIGHT))
+    build_ms = (time.perf_counter() - start) * 1000
+    per_line_ms = time_frames(lambda: draw_menu_per_line(surface))
+    cached_ms = time_frames(lambda: surface.blit(cache.get("menu", (WIDTH, HEIGHT)), (0, 0)))
+    print(f"menu background: per-line {per_line_ms:.3f} ms, cached {cached_ms:.3f} ms, build {build_ms:.3f} ms, speedup {per_line_ms / cached_ms:.1f}x")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import heapq
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from dungeon import WALL, FreeCellIndex, flow_field, generate_dungeon
+
+GRID_SIZES = [(25, 18), (100, 72)]
+ENEMY_COUNTS = [5, 15, 100, 500]
+PLAYER_MOVES = 20
+
+def astar_first_step(walkable, start, goal):
+    grid_height, grid_width = walkable.shape
+    goal_x, goal_y = goal
+    frontier = [(0, 0, start, None)]
+    first_steps = {start: None}
+    best = {start: 0}
+    while frontier:
+        _, cost, (x, y), first = heapq.heappop(frontier)
+        if (x, y) == goal:
+            return first
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < grid_width and 0 <= ny < grid_height and walkable[ny, nx] and best.get((nx, ny), cost + 2) > cost + 1:
+                best[(nx, ny)] = cost + 1
+                step = first if first is not None else (nx, ny)
+                heapq.heappush(frontier, (cost + 1 + abs(goal_x - nx) + abs(goal_y - ny), cost + 1, (nx, ny), step))
+    return None
+
+def flow_first_steps(walkable, enemies, goal):
+    flow = flow_field(walkable, *goal)
+    grid_height, grid_width = walkable.shape
+    padded = np.pad(np.where(flow >= 0, flow, np.iinfo(np.int32).max), 1, constant_values=np.iinfo(np.int32).max)
+    x, y = enemies[:, 0] + 1, enemies[:, 1] + 1
+    neighbours = np.stack([padded[y - 1, x], padded[y + 1, x], padded[y, x - 1], padded[y, x + 1]], axis=1)
+    return neighbours.argmin(axis=1)
+
+def main():
+    print(f"{'grid':>8} {'enemies':>8} {'A* ms/move':>11} {'flow ms/move':>13} {'speedup':>8}")
+    for grid_width, grid_height in GRID_SIZES:
+        dungeon_map = generate_dungeon(grid_width, grid_height, 1)[0]
+        walkable = dungeon_map != WALL
+        for enemy_count in ENEMY_COUNTS:
+            free_cells = FreeCellIndex(dungeon_map, random.Random(enemy_count))
+            if len(free_cells) <= enemy_count + PLAYER_MOVES:
+                continue
+            enemies = np.array([free_cells.sample() for _ in range(enemy_count)])
+            goals = [free_cells.sample() for _ in range(PLAYER_MOVES)]
+            start = time.perf_counter()
+            for goal in goals:
+                for x, y in enemies.tolist():
+                    astar_first_step(walkable, (x, y), goal)
+            astar_ms = (time.perf_counter() - start) / PLAYER_MOVES * 1000
+            start = time.perf_counter()
+            for goal in goals:
+                flow_first_steps(walkable, enemies, goal)
+            flow_ms = (time.perf_counter() - start) / PLAYER_MOVES * 1000
+            print(f"{grid_width:>4}x{grid_height:<3} {enemy_count:>8} {astar_ms:>11.3f} {flow_ms:>13.3f} {astar_ms / flow_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation import EMPTY, GameSimulation
+
+ENEMY_COUNTS = [15, 1000, 5000]
+GRID_SIZE = 200
+REPEAT = 2000
+
+def scan_collision(sim):
+    player = sim.player
+    for enemy in sim.enemies:
+        if enemy.grid_x == player.grid_x and enemy.grid_y == player.grid_y and not enemy.moving:
+            return True
+    return False
+
+def grid_collision(sim):
+    player = sim.player
+    occupant = sim.occupancy.occupant(player.grid_x, player.grid_y)
+    return occupant != EMPTY and not sim.swarm.moving[occupant]
+
+def time_call(call, repeat=REPEAT):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def main():
+    print(f"{'enemies':>8} {'scan us':>9} {'grid us':>9} {'step ms':>8}")
+    for enemy_count in ENEMY_COUNTS:
+        sim = GameSimulation(seed=1, grid_width=GRID_SIZE, grid_height=GRID_SIZE)
+        sim.enemies_per_round = enemy_count
+        sim.build_round()
+        scan_us = time_call(lambda: scan_collision(sim))
+        grid_us = time_call(lambda: grid_collision(sim))
+        step_ms = time_call(sim.step, repeat=100) / 1000
+        print(f"{enemy_count:>8} {scan_us:>9.2f} {grid_us:>9.2f} {step_ms:>8.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from dungeon import (BLASTS_PER_BASE_AREA, CORRIDORS_PER_BASE_AREA, ROOMS_PER_BASE_AREA,
+                     feature_count, generate_dungeon, generate_dungeons)
+
+GRID_SIZES = [(25, 18), (100, 100), (500, 500), (1000, 1000)]
+BATCH_SIZE = 64
+
+def generate_dungeon_lists(grid_width, grid_height, rng):
+    rooms = feature_count(ROOMS_PER_BASE_AREA, grid_width, grid_height)
+    corridors = feature_count(CORRIDORS_PER_BASE_AREA, grid_width, grid_height)
+    blasts = feature_count(BLASTS_PER_BASE_AREA, grid_width, grid_height)
+    dungeon = [[1 for _ in range(grid_width)] for _ in range(grid_height)]
+    for _ in range(rooms):
+        room_width = rng.randint(4, 8)
+        room_height = rng.randint(4, 6)
+        room_x = rng.randint(2, grid_width - room_width - 2)
+        room_y = rng.randint(2, grid_height - room_height - 2)
+        for y in range(room_y, room_y + room_height):
+            for x in range(room_x, room_x + room_width):
+                dungeon[y][x] = 0
+    for _ in range(corridors):
+        corridor_x = rng.randint(2, grid_width - 3)
+        corridor_y = rng.randint(2, grid_height - 3)
+        if rng.choice([True, False]):
+            for i in range(rng.randint(3, 10)):
+                if corridor_x + i < grid_width - 2:
+                    dungeon[corridor_y][corridor_x + i] = 0
+        else:
+            for i in range(rng.randint(3, 8)):
+                if corridor_y + i < grid_height - 2:
+                    dungeon[corridor_y + i][corridor_x] = 0
+    while True:
+        exit_x = rng.randint(5, grid_width - 6)
+        exit_y = rng.randint(5, grid_height - 6)
+        if dungeon[exit_y][exit_x] == 0:
+            dungeon[exit_y][exit_x] = 2
+            break
+    for _ in range(blasts):
+        x = rng.randint(1, grid_width - 2)
+        y = rng.randint(1, grid_height - 2)
+        if dungeon[y][x] == 1:
+            for dx in [-1, 0, 1]:
+                for dy in [-1, 0, 1]:
+                    if 0 <= x + dx < grid_width and 0 <= y + dy < grid_height:
+                        dungeon[y + dy][x + dx] = 0
+    return dungeon
+
+def maps_per_second(generate, maps_per_call, min_time=0.5):
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        generate(calls)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls * maps_per_call / elapsed
+
+def main():
+    assert np.array_equal(generate_dungeon(40, 30, seed=7)[0], generate_dungeon(40, 30, seed=7)[0])
+    print(f"{'grid':>10} {'lists maps/s':>13} {'numpy maps/s':>13} {'batch maps/s':>13}")
+    for grid_width, grid_height in GRID_SIZES:
+        rng = random.Random(0)
+        lists_rate = maps_per_second(lambda _: generate_dungeon_lists(grid_width, grid_height, rng), 1)
+        numpy_rate = maps_per_second(lambda seed: generate_dungeon(grid_width, grid_height, seed), 1)
+        batch = BATCH_SIZE if grid_width * grid_height <= 10000 else 4
+        batch_rate = maps_per_second(lambda seed: generate_dungeons(batch, grid_width, grid_height, seed), batch)
+        print(f"{grid_width:>4}x{grid_height:<5} {lists_rate:>13.1f} {numpy_rate:>13.1f} {batch_rate:>13.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from dungeon import WALL, generate_dungeon
+from fov import FieldOfView
+
+GRID_SIZES = [(25, 18), (200, 144), (1000, 1000)]
+MOVES = 2000
+
+def tuple_set_bytes(cells):
+    return sys.getsizeof(cells) + sum(sys.getsizeof(cell) for cell in cells)
+
+def main():
+    print(f"{'grid':>10} {'update us':>10} {'explored':>9} {'bool grid KB':>13} {'tuple set KB':>13}")
+    for grid_width, grid_height in GRID_SIZES:
+        dungeon_map = generate_dungeon(grid_width, grid_height, 1)[0]
+        walkable = dungeon_map != WALL
+        field_of_view = FieldOfView(walkable)
+        explored = np.zeros(walkable.shape, dtype=bool)
+        floor_y, floor_x = np.nonzero(walkable)
+        picks = np.random.default_rng(1).integers(len(floor_x), size=MOVES)
+        start = time.perf_counter()
+        for x, y in zip(floor_x[picks].tolist(), floor_y[picks].tolist()):
+            field_of_view.update(x, y)
+            explored[field_of_view.rows, field_of_view.columns] |= field_of_view.visible
+        update_us = (time.perf_counter() - start) / MOVES * 1e6
+        ys, xs = np.nonzero(explored)
+        cells = set(zip(xs.tolist(), ys.tolist()))
+        print(f"{grid_width:>5}x{grid_height:<4} {update_us:>10.1f} {len(cells):>9} {explored.nbytes / 1024:>13.1f} {tuple_set_bytes(cells) / 1024:>13.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from levels import LevelPipeline, create_level_pool
+from simulation import GameSimulation
+
+GRID_SIZES = [(25, 18), (100, 72), (200, 144), (400, 288)]
+ROUNDS = 8
+PLAY_TIME = 0.5
+
+def round_transitions(grid_width, grid_height, levels):
+    sim = GameSimulation(1, grid_width, grid_height, levels=levels)
+    times = []
+    for _ in range(ROUNDS):
+        time.sleep(PLAY_TIME)
+        start = time.perf_counter()
+        sim.start_new_round()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+def main():
+    levels = LevelPipeline(create_level_pool())
+    print(f"{'grid':>8} {'sync ms':>9} {'max':>8} {'pooled ms':>10} {'max':>8}")
+    for grid_width, grid_height in GRID_SIZES:
+        sync = round_transitions(grid_width, grid_height, None)
+        pooled = round_transitions(grid_width, grid_height, levels)
+        print(f"{grid_width:>4}x{grid_height:<3} {statistics.median(sync):>9.2f} {max(sync):>8.2f} {statistics.median(pooled):>10.2f} {max(pooled):>8.2f}")
+    print(f"{levels.hits} levels taken ready-made, {levels.misses} generated on the spot")
+    levels.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.simulation import wander_script
+from replay import InputRecorder, load, make_simulation, verify
+
+SESSIONS = 200
+SESSION_SECONDS = 30
+
+def record_session(seed, path):
+    sim = make_simulation(seed)
+    recorder = InputRecorder(sim)
+    script = wander_script(seed, SESSION_SECONDS, hold_time=0.3)
+    index = 0
+    for _ in range(round(SESSION_SECONDS / sim.fixed_dt)):
+        while index < len(script) and script[index][0] <= sim.tick * sim.fixed_dt:
+            _, kind, action = script[index]
+            recorder.key_down(action) if kind == "down" else recorder.key_up(action)
+            index += 1
+        sim.step()
+    recorder.save(path)
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, f"{seed:04d}.drec") for seed in range(SESSIONS)]
+        for seed, path in enumerate(paths):
+            record_session(seed, path)
+        size = sum(os.path.getsize(path) for path in paths)
+        start = time.perf_counter()
+        results = [verify(load(path)) for path in paths]
+        elapsed = time.perf_counter() - start
+    mismatches = sum(not matched for matched, _, _ in results)
+    print(f"{SESSIONS} sessions of {SESSION_SECONDS}s, {size / SESSIONS:.0f} bytes each on average")
+    print(f"replayed in {elapsed:.2f}s ({SESSIONS * SESSION_SECONDS / elapsed:.0f} simulated seconds per wall-clock second), {mismatches} mismatches")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation import MOVES, GameSimulation
+
+SIMULATED_SECONDS = 600
+RUNS = 5
+
+def wander_script(seed, duration, hold_time=0.5):
+    rng = random.Random(seed)
+    script = []
+    t = 0.0
+    while t < duration:
+        action = rng.choice(list(MOVES))
+        script.append((t, "down", action))
+        script.append((t + hold_time, "up", action))
+        t += hold_time
+    return script
+
+def main():
+    total_wall = 0.0
+    for seed in range(RUNS):
+        script = wander_script(seed, SIMULATED_SECONDS)
+        start = time.perf_counter()
+        sim = GameSimulation(seed=seed).run(script, duration=SIMULATED_SECONDS)
+        wall = time.perf_counter() - start
+        total_wall += wall
+        print(f"seed {seed}: {sim.tick} ticks in {wall:.3f}s, round {sim.current_round}, score {sim.score}, health {sim.player.health}")
+    print(f"{RUNS * SIMULATED_SECONDS / total_wall:.0f} simulated seconds per wall-clock second")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from dungeon import FLOOR, WALL, FreeCellIndex, generate_dungeon
+
+GRID_SIZES = [(25, 18), (200, 200), (1000, 1000)]
+SPAWN_COUNTS = [15, 300]
+
+def sparse_grid(grid_width, grid_height, floor_fraction, seed):
+    rng = np.random.default_rng(seed)
+    return np.where(rng.random((grid_height, grid_width)) < floor_fraction, FLOOR, WALL).astype(np.uint8)
+
+def rejection_spawn(grid, count, rng):
+    grid_height, grid_width = grid.shape
+    positions = []
+    for _ in range(count):
+        while True:
+            x = rng.randint(0, grid_width - 1)
+            y = rng.randint(0, grid_height - 1)
+            if grid[y, x] == FLOOR:
+                positions.append((x, y))
+                break
+    return positions
+
+def index_spawn(grid, count, rng):
+    free_cells = FreeCellIndex(grid, rng)
+    return [free_cells.sample() for _ in range(count)]
+
+def time_call(call, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    rng = random.Random(0)
+    print(f"{'grid':>10} {'spawns':>7} {'floor %':>8} {'rejection ms':>13} {'index ms':>9} {'sample us':>10}")
+    grids = [generate_dungeon(grid_width, grid_height, seed=1)[0] for grid_width, grid_height in GRID_SIZES]
+    grids.append(sparse_grid(200, 200, 0.01, seed=1))
+    for grid in grids:
+        grid_height, grid_width = grid.shape
+        for count in SPAWN_COUNTS:
+            if count > (grid == FLOOR).sum():
+                continue
+            rejection_ms = time_call(lambda: rejection_spawn(grid, count, rng))
+            index_ms = time_call(lambda: index_spawn(grid, count, rng))
+            free_cells = FreeCellIndex(grid, rng)
+            sample_us = time_call(lambda: [free_cells.sample() for _ in range(count)], repeat=1) / count * 1000
+            print(f"{grid_width:>4}x{grid_height:<5} {count:>7} {(grid == FLOOR).mean() * 100:>7.1f}% {rejection_ms:>13.3f} {index_ms:>9.3f} {sample_us:>10.2f}")
+
+if __name__ == "__main__":
+    main()
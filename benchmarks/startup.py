@@ -0,0 +1,28 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 5
+
+def launch():
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", DUNGEON_STARTUP_REPORT="1")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "main.py")], env=env, capture_output=True, text=True, timeout=60)
+    wall = time.perf_counter() - start
+    for line in result.stdout.splitlines():
+        if line.startswith("time to first frame:"):
+            return float(line.split(":")[1].split()[0]), wall * 1000
+    raise RuntimeError(f"main.py did not report its first frame:\n{result.stdout}{result.stderr}")
+
+def main():
+    samples = [launch() for _ in range(RUNS)]
+    first_frame = [sample[0] for sample in samples]
+    process = [sample[1] for sample in samples]
+    print(f"time to first frame: median {statistics.median(first_frame):.1f} ms, max {max(first_frame):.1f} ms")
+    print(f"process launch to exit: median {statistics.median(process):.1f} ms, max {max(process):.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import types
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pygame
+from dungeon import FreeCellIndex, generate_dungeon
+from simulation import GameSimulation
+
+GRID_SIZES = ["25x18", "50x36", "100x72"]
+ENEMY_COUNTS = [5, 15, 100]
+DRAW_STATES = ["menu", "instructions", "playing", "round_complete", "game_over"]
+PERCENTILES = [50, 90, 99]
+THRESHOLD = 0.10
+
+def parse_grid(text):
+    grid_width, grid_height = text.lower().split("x")
+    return int(grid_width), int(grid_height)
+
+def build_simulation(grid_width, grid_height, enemy_count, seed=1):
+    sim = GameSimulation(seed, grid_width, grid_height)
+    sim.enemies_per_round = enemy_count
+    sim.build_round()
+    sim.drain_events()
+    return sim
+
+def measure(function, repeat, warmup=3):
+    for _ in range(warmup):
+        function()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples = np.array(samples)
+    summary = {f"p{percentile}_us": float(np.percentile(samples, percentile)) for percentile in PERCENTILES}
+    summary.update(mean_us=float(samples.mean()), min_us=float(samples.min()), max_us=float(samples.max()), samples=repeat)
+    return summary
+
+def bench_generate(grid_width, grid_height, repeat):
+    seeds = iter(range(10 ** 9))
+    return measure(lambda: generate_dungeon(grid_width, grid_height, next(seeds)), repeat)
+
+def bench_free_cell(grid_width, grid_height, repeat):
+    free_cells = FreeCellIndex(generate_dungeon(grid_width, grid_height, 1)[0], random.Random(1))
+    def sample_and_release():
+        x, y = free_cells.sample()
+        free_cells.release(x, y)
+    return measure(sample_and_release, repeat)
+
+def bench_step(grid_width, grid_height, enemy_count, repeat):
+    sim = build_simulation(grid_width, grid_height, enemy_count)
+    sim.player.health = 10 ** 9
+    return measure(sim.step, repeat)
+
+def load_game():
+    # Loads main.py the way the pgzrun runner does, minus the event loop.
+    from pgzero.runner import prepare_mod
+    from pgzero.screen import Screen
+    sys._pgzrun = True
+    path = os.path.join(ROOT, "main.py")
+    game = types.ModuleType("main")
+    game.__file__ = path
+    prepare_mod(game)
+    with open(path) as file:
+        exec(compile(file.read(), path, "exec"), game.__dict__)
+    game.screen = Screen(pygame.display.set_mode((game.WIDTH, game.HEIGHT)))
+    game.assets.loaded.wait()
+    return game
+
+def set_draw_state(game, state, grid_width, grid_height, enemy_count):
+    game.sim = build_simulation(grid_width, grid_height, enemy_count)
+    game.refresh_tile_layer()
+    game.refresh_territory_layer()
+    game.game_state = "playing" if state == "game_over" else state
+    if state == "game_over":
+        game.sim.player.health = 0
+    game.draw()
+
+def bench_draw(game, state, grid_width, grid_height, enemy_count, repeat):
+    set_draw_state(game, state, grid_width, grid_height, enemy_count)
+    return measure(game.draw, repeat)
+
+def run(grid_sizes, enemy_counts, repeat):
+    results = {}
+    game = load_game()
+    for grid in grid_sizes:
+        grid_width, grid_height = parse_grid(grid)
+        results[f"generate_dungeon[{grid}]"] = bench_generate(grid_width, grid_height, repeat)
+        results[f"free_cell_sample[{grid}]"] = bench_free_cell(grid_width, grid_height, repeat)
+        for enemy_count in enemy_counts:
+            results[f"update[{grid},{enemy_count}]"] = bench_step(grid_width, grid_height, enemy_count, repeat)
+        for state in DRAW_STATES:
+            counts = enemy_counts if state in ("playing", "round_complete", "game_over") else enemy_counts[:1]
+            for enemy_count in counts:
+                name = f"draw[{state},{grid},{enemy_count}]" if len(counts) > 1 else f"draw[{state},{grid}]"
+                results[name] = bench_draw(game, state, grid_width, grid_height, enemy_count, repeat)
+    pygame.quit()
+    return results
+
+def compare(baseline, current, threshold, metric):
+    regressions = 0
+    print(f"{'case':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            print(f"{name:<40} {'-':>10} {result[metric]:>10.1f}      new")
+            continue
+        before = baseline["results"][name][metric]
+        after = result[metric]
+        change = after / before - 1 if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{name:<40} {before:>10.1f} {after:>10.1f} {change:>+7.1%}{flag}")
+    print(f"{regressions} regressions over {threshold:.0%} in {metric}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Time dungeon generation, spawning, simulation ticks and draws.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run")
+    run_parser.add_argument("--grid", nargs="+", default=GRID_SIZES, help="grid sizes as WIDTHxHEIGHT")
+    run_parser.add_argument("--enemies", nargs="+", type=int, default=ENEMY_COUNTS)
+    run_parser.add_argument("--repeat", type=int, default=100)
+    run_parser.add_argument("--output", help="write results as JSON to this file")
+    compare_parser = commands.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    compare_parser.add_argument("--metric", default="p50_us")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run(args.grid, args.enemies, args.repeat)
+        report = {"python": platform.python_version(), "platform": platform.platform(), "repeat": args.repeat, "results": results}
+        for name, result in results.items():
+            print(f"{name:<40} p50 {result['p50_us']:>10.1f} us  p99 {result['p99_us']:>10.1f} us")
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(report, file, indent=2)
+    else:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        with open(args.current) as file:
+            current = json.load(file)
+        sys.exit(1 if compare(baseline, current, args.threshold, args.metric) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from dungeon import FLOOR, WALL, generate_dungeon
+from simulation import EMPTY, FIXED_DT, Character, EnemySwarm, OccupancyGrid
+
+ENEMY_COUNTS = [10, 1000, 100000]
+OBJECT_ENEMY_COUNTS = [10]
+GRID_SIZE = 500
+FRAMES = 600
+
+class ObjectWorld:
+    def __init__(self, grid, seed):
+        grid_height, grid_width = grid.shape
+        self.grid = grid
+        self.rng = random.Random(seed)
+        self.occupancy = OccupancyGrid(grid_width, grid_height)
+    def is_walkable(self, x, y):
+        grid_height, grid_width = self.grid.shape
+        return 0 <= x < grid_width and 0 <= y < grid_height and self.grid[y, x] != WALL
+
+class ObjectEnemy(Character):
+    # The per-object enemy loop EnemySwarm replaced: every enemy steps its own pixels and timer each tick.
+    def __init__(self, world, entity_id, x, y, territory_radius):
+        super().__init__(world, x, y, "enemy")
+        self.entity_id = entity_id
+        world.occupancy.cells[y, x] = entity_id
+        self.territory_center = (x, y)
+        self.territory_radius = territory_radius
+        self.move_timer = 0
+        self.move_interval = world.rng.uniform(1.0, 3.0)
+    def update(self, dt):
+        super().update(dt)
+        if not self.moving:
+            self.move_timer += dt
+            if self.move_timer >= self.move_interval:
+                self.move_timer = 0
+                self.move_interval = self.simulation.rng.uniform(1.0, 3.0)
+                self.try_random_move()
+    def try_random_move(self):
+        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        self.simulation.rng.shuffle(directions)
+        for dx, dy in directions:
+            new_x = self.grid_x + dx
+            new_y = self.grid_y + dy
+            if math.sqrt((new_x - self.territory_center[0]) ** 2 + (new_y - self.territory_center[1]) ** 2) <= self.territory_radius:
+                if self.move_to(new_x, new_y):
+                    break
+    def move_to(self, grid_x, grid_y):
+        old_x, old_y = self.grid_x, self.grid_y
+        if not super().move_to(grid_x, grid_y):
+            return False
+        self.simulation.occupancy.cells[old_y, old_x] = EMPTY
+        self.simulation.occupancy.cells[grid_y, grid_x] = self.entity_id
+        return True
+    def is_valid_position(self, x, y):
+        return super().is_valid_position(x, y) and self.simulation.occupancy.occupant(x, y) == EMPTY
+
+def spawn_positions(grid, enemy_count, rng):
+    grid_width = grid.shape[1]
+    cells = rng.choice(np.flatnonzero(grid.ravel() == FLOOR), enemy_count, replace=False)
+    return np.stack([cells % grid_width, cells // grid_width], axis=1), rng.integers(2, 5, enemy_count)
+
+def build_swarm(grid, enemy_count, seed):
+    rng = np.random.default_rng(seed)
+    grid_height, grid_width = grid.shape
+    positions, radii = spawn_positions(grid, enemy_count, rng)
+    return EnemySwarm(positions, radii, OccupancyGrid(grid_width, grid_height), grid != WALL, rng)
+
+def build_objects(grid, enemy_count, seed):
+    world = ObjectWorld(grid, seed)
+    positions, radii = spawn_positions(grid, enemy_count, np.random.default_rng(seed))
+    return [ObjectEnemy(world, entity_id, x, y, radius) for entity_id, ((x, y), radius) in enumerate(zip(positions.tolist(), radii.tolist()))]
+
+def time_frames(update):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        update(FIXED_DT)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+def update_objects(enemies):
+    def update(dt):
+        for enemy in enemies:
+            enemy.update(dt)
+    return update
+
+def main():
+    grid = generate_dungeon(GRID_SIZE, GRID_SIZE, seed=1)[0]
+    print(f"{'layout':>8} {'enemies':>8} {'frame ms':>9} {'ns/enemy':>9}")
+    for enemy_count in OBJECT_ENEMY_COUNTS:
+        frame_ms = time_frames(update_objects(build_objects(grid, enemy_count, seed=enemy_count)))
+        print(f"{'objects':>8} {enemy_count:>8} {frame_ms:>9.3f} {frame_ms * 1e6 / enemy_count:>9.1f}")
+    for enemy_count in ENEMY_COUNTS:
+        frame_ms = time_frames(build_swarm(grid, enemy_count, seed=enemy_count).update)
+        print(f"{'swarm':>8} {enemy_count:>8} {frame_ms:>9.3f} {frame_ms * 1e6 / enemy_count:>9.1f}")
+
+if __name__ == "__main__":
+    main()
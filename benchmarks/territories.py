@@ -0,0 +1,53 @@
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from rendering import TERRITORY_COLOR, render_territory_layer
+
+WIDTH, HEIGHT = 800, 600
+CELL_SIZE = 32
+GRID_WIDTH = WIDTH // CELL_SIZE
+GRID_HEIGHT = HEIGHT // CELL_SIZE
+ENEMY_COUNTS = [5, 15, 100, 1000]
+FRAMES = 30
+
+def draw_per_enemy(surface, dungeon_map, territories):
+    for (center_x, center_y), radius in territories:
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                tx = center_x + dx
+                ty = center_y + dy
+                if (0 <= tx < GRID_WIDTH and 0 <= ty < GRID_HEIGHT and
+                    dx * dx + dy * dy <= radius * radius and
+                    dungeon_map[ty][tx] == 0):
+                    if dx * dx + dy * dy >= (radius - 0.5) * (radius - 0.5):
+                        pygame.draw.rect(surface, TERRITORY_COLOR, pygame.Rect(tx * CELL_SIZE + 1, ty * CELL_SIZE + 1, CELL_SIZE - 2, CELL_SIZE - 2))
+
+def time_frames(draw_frame):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        draw_frame()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+def main():
+    pygame.init()
+    surface = pygame.display.set_mode((WIDTH, HEIGHT))
+    dungeon_map = [[random.choice((0, 0, 1)) for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+    print(f"{'enemies':>8} {'per-enemy ms':>13} {'cached ms':>10} {'build ms':>9} {'speedup':>8}")
+    for enemy_count in ENEMY_COUNTS:
+        territories = [((random.randrange(GRID_WIDTH), random.randrange(GRID_HEIGHT)), random.randint(2, 4)) for _ in range(enemy_count)]
+        start = time.perf_counter()
+        layer = render_territory_layer(dungeon_map, territories, CELL_SIZE)
+        build_ms = (time.perf_counter() - start) * 1000
+        per_enemy_ms = time_frames(lambda: draw_per_enemy(surface, dungeon_map, territories))
+        cached_ms = time_frames(lambda: surface.blit(layer, (0, 0)))
+        print(f"{enemy_count:>8} {per_enemy_ms:>13.3f} {cached_ms:>10.3f} {build_ms:>9.3f} {per_enemy_ms / cached_ms:>7.1f}x")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from rendering import BACKGROUND_COLOR, EXIT_COLOR, EXIT_INNER_COLOR, FLOOR_COLOR, WALL_COLOR, render_tile_layer
+
+WIDTH, HEIGHT = 800, 600
+GRID_SIZES = [(25, 18, 32), (50, 37, 16), (100, 75, 8), (200, 150, 4)]
+FRAMES = 60
+
+def random_map(grid_width, grid_height):
+    dungeon = [[random.choice((0, 1)) for _ in range(grid_width)] for _ in range(grid_height)]
+    dungeon[grid_height // 2][grid_width // 2] = 2
+    return dungeon
+
+def draw_per_cell(surface, dungeon_map, cell_size):
+    for y in range(len(dungeon_map)):
+        for x in range(len(dungeon_map[0])):
+            cell_type = dungeon_map[y][x]
+            rect = pygame.Rect(x * cell_size, y * cell_size, cell_size, cell_size)
+            if cell_type == 1:
+                pygame.draw.rect(surface, WALL_COLOR, rect)
+            elif cell_type == 2:
+                pygame.draw.rect(surface, EXIT_COLOR, rect)
+                pygame.draw.rect(surface, EXIT_INNER_COLOR, rect.inflate(-4, -4))
+            else:
+                pygame.draw.rect(surface, FLOOR_COLOR, rect)
+
+def time_frames(draw_frame):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        draw_frame()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+def main():
+    pygame.init()
+    surface = pygame.display.set_mode((WIDTH, HEIGHT))
+    print(f"{'grid':>10} {'cells':>7} {'per-cell ms':>12} {'cached ms':>10} {'build ms':>9} {'speedup':>8}")
+    for grid_width, grid_height, cell_size in GRID_SIZES:
+        dungeon_map = random_map(grid_width, grid_height)
+        def per_cell_frame():
+            surface.fill(BACKGROUND_COLOR)
+            draw_per_cell(surface, dungeon_map, cell_size)
+        start = time.perf_counter()
+        layer = render_tile_layer(dungeon_map, cell_size)
+        build_ms = (time.perf_counter() - start) * 1000
+        def cached_frame():
+            surface.fill(BACKGROUND_COLOR)
+            surface.blit(layer, (0, 0))
+        per_cell_ms = time_frames(per_cell_frame)
+        cached_ms = time_frames(cached_frame)
+        print(f"{grid_width:>4}x{grid_height:<5} {grid_width * grid_height:>7} {per_cell_ms:>12.3f} {cached_ms:>10.3f} {build_ms:>9.3f} {per_cell_ms / cached_ms:>7.1f}x")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
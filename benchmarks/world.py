@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from rendering import ChunkRenderer
+from simulation import CELL_SIZE, EMPTY, WorldSimulation
+from world import CHUNK_SIZE, Camera
+from benchmarks.simulation import wander_script
+
+WIDTH, HEIGHT = 800, 540
+WORLD_SIZES = [100, 250, 500, 1000]
+DURATION = 60.0
+FRAME_EVERY = 1
+
+def surface_bytes(renderer):
+    return sum(surface.get_bytesize() * surface.get_width() * surface.get_height() for surface in renderer.surfaces.values())
+
+def main():
+    pygame.init()
+    surface = pygame.display.set_mode((WIDTH, HEIGHT))
+    print(f"{'world':>6} {'step us':>8} {'frame ms':>9} {'drawn':>6} {'enemies':>8} {'chunks':>7} {'grid MB':>8} {'cache MB':>9}")
+    for world_size in WORLD_SIZES:
+        chunks = -(-world_size // CHUNK_SIZE)
+        sim = WorldSimulation(seed=1, chunks_wide=chunks, chunks_high=chunks)
+        camera = Camera(WIDTH, HEIGHT, CELL_SIZE)
+        renderer = ChunkRenderer(CELL_SIZE, 2 * camera.max_visible_chunks(CHUNK_SIZE))
+        script = sorted(wander_script(7, DURATION, hold_time=2.0))
+        frame_ms = []
+        drawn = 0
+        step_seconds = 0.0
+        script_index = 0
+        for tick in range(int(DURATION / sim.fixed_dt)):
+            now = tick * sim.fixed_dt
+            while script_index < len(script) and script[script_index][0] <= now:
+                _, kind, action = script[script_index]
+                sim.key_down(action) if kind == "down" else sim.key_up(action)
+                script_index += 1
+            start = time.perf_counter()
+            sim.step()
+            step_seconds += time.perf_counter() - start
+            start = time.perf_counter()
+            camera.follow(sim.player.pixel_x, sim.player.pixel_y, sim.grid_width, sim.grid_height)
+            renderer.draw(surface, sim.world, sim.swarm, camera)
+            first_x, first_y, last_x, last_y = camera.visible_cells(margin=2)
+            cells = sim.occupancy.cells[max(first_y, 0):last_y, max(first_x, 0):last_x]
+            drawn = int((cells != EMPTY).sum())
+            frame_ms.append((time.perf_counter() - start) * 1000)
+        grid_mb = (sim.dungeon_map.nbytes + sim.walkable.nbytes + sim.occupancy.cells.nbytes) / 2 ** 20
+        step_us = step_seconds / len(frame_ms) * 1e6
+        print(f"{sim.grid_width:>6} {step_us:>8.1f} {sum(frame_ms) / len(frame_ms):>9.3f} {drawn:>6} {sim.swarm.count:>8} "
+              f"{int(sim.world.generated.sum()):>7} {grid_mb:>8.2f} {surface_bytes(renderer) / 2 ** 20:>9.2f}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import numpy as np
+
+FLOOR, WALL, EXIT = 0, 1, 2
+
+BASE_AREA = 25 * 18
+ROOMS_PER_BASE_AREA = 15
+CORRIDORS_PER_BASE_AREA = 30
+BLASTS_PER_BASE_AREA = 20
+EXIT_MARGIN = 5
+
+def feature_count(per_base_area, grid_width, grid_height):
+    return max(1, round(per_base_area * grid_width * grid_height / BASE_AREA))
+
+def carve_rectangles(coverage, maps, x0, y0, x1, y1):
+    # Difference-array rectangle fill: +1/-1 at the corners, prefix sums recover coverage.
+    _, height, width = coverage.shape
+    base = maps * (height * width)
+    corners = np.concatenate([base + y0 * width + x0, base + y0 * width + x1, base + y1 * width + x0, base + y1 * width + x1])
+    weights = np.repeat(np.array([1, -1, -1, 1]), len(maps))
+    coverage += np.bincount(corners, weights, minlength=coverage.size).astype(coverage.dtype).reshape(coverage.shape)
+
+def covered(coverage):
+    return coverage.cumsum(axis=1).cumsum(axis=2)[:, :-1, :-1] > 0
+
+def carve_floor(count, grid_width, grid_height, rng):
+    coverage = np.zeros((count, grid_height + 1, grid_width + 1), dtype=np.int32)
+
+    rooms = feature_count(ROOMS_PER_BASE_AREA, grid_width, grid_height)
+    maps = np.repeat(np.arange(count), rooms)
+    room_width = rng.integers(4, 9, size=count * rooms)
+    room_height = rng.integers(4, 7, size=count * rooms)
+    room_x = rng.integers(2, grid_width - room_width - 1)
+    room_y = rng.integers(2, grid_height - room_height - 1)
+    carve_rectangles(coverage, maps, room_x, room_y, room_x + room_width, room_y + room_height)
+
+    corridors = feature_count(CORRIDORS_PER_BASE_AREA, grid_width, grid_height)
+    maps = np.repeat(np.arange(count), corridors)
+    corridor_x = rng.integers(2, grid_width - 2, size=count * corridors)
+    corridor_y = rng.integers(2, grid_height - 2, size=count * corridors)
+    horizontal = rng.random(count * corridors) < 0.5
+    length = np.where(horizontal, rng.integers(3, 11, size=count * corridors), rng.integers(3, 9, size=count * corridors))
+    end_x = np.where(horizontal, np.minimum(corridor_x + length, grid_width - 2), corridor_x + 1)
+    end_y = np.where(horizontal, corridor_y + 1, np.minimum(corridor_y + length, grid_height - 2))
+    carve_rectangles(coverage, maps, corridor_x, corridor_y, end_x, end_y)
+
+    floor = covered(coverage)
+    blasts = feature_count(BLASTS_PER_BASE_AREA, grid_width, grid_height)
+    maps = np.repeat(np.arange(count), blasts)
+    blast_x = rng.integers(1, grid_width - 1, size=count * blasts)
+    blast_y = rng.integers(1, grid_height - 1, size=count * blasts)
+    solid = ~floor[maps, blast_y, blast_x]
+    carve_rectangles(coverage, maps[solid], blast_x[solid] - 1, blast_y[solid] - 1, blast_x[solid] + 2, blast_y[solid] + 2)
+    return covered(coverage)
+
+def generate_dungeons(count, grid_width, grid_height, seed=None):
+    rng = np.random.default_rng(seed)
+    floor = carve_floor(count, grid_width, grid_height, rng)
+    labels = label_components(floor)
+    main = main_components(labels)
+    reachable = labels == main[:, None, None]
+    grids = np.where(reachable, FLOOR, WALL).astype(np.uint8)
+    exits = place_exits(grids, rng, reachable)
+    grids[np.arange(count), exits[:, 1], exits[:, 0]] = EXIT
+    distances = distance_fields(reachable, exits)
+    return grids, exits, distances
+
+def generate_chunk(chunk_size, seed=None):
+    # A cross through the chunk's middle row and column reaches all four edges, so neighbouring
+    # chunks always join up; pockets not connected to the cross are filled.
+    rng = np.random.default_rng(seed)
+    floor = carve_floor(1, chunk_size, chunk_size, rng)
+    middle = chunk_size // 2
+    floor[0, middle, :] = True
+    floor[0, :, middle] = True
+    labels = label_components(floor)[0]
+    return np.where(labels == labels[middle, middle], FLOOR, WALL).astype(np.uint8)
+
+def label_components(walkable):
+    # Cells start labelled by the first cell of their horizontal run; vertical links are then
+    # merged as a vectorized union-find (hook roots, then pointer jumping).
+    index = np.arange(walkable.size).reshape(walkable.shape)
+    run_start = walkable.copy()
+    run_start[..., 1:] &= ~walkable[..., :-1]
+    labels = np.maximum.accumulate(np.where(run_start, index, 0).ravel())
+    linked = walkable[..., :-1, :] & walkable[..., 1:, :]
+    first = index[..., :-1, :][linked]
+    second = index[..., 1:, :][linked]
+    while True:
+        first_label = labels[first]
+        second_label = labels[second]
+        differ = first_label != second_label
+        if not differ.any():
+            break
+        first, second = first[differ], second[differ]
+        first_label, second_label = first_label[differ], second_label[differ]
+        np.minimum.at(labels, np.maximum(first_label, second_label), np.minimum(first_label, second_label))
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    labels = labels.reshape(walkable.shape)
+    labels[~walkable] = -1
+    return labels
+
+def distance_fields(walkable, starts):
+    # Breadth-first search from one start per map; unreachable cells stay at -1.
+    count, grid_height, grid_width = walkable.shape
+    padded = np.zeros((count, grid_height + 2, grid_width + 2), dtype=bool)
+    padded[:, 1:-1, 1:-1] = walkable
+    open_cells = padded.ravel()
+    row = grid_width + 2
+    offsets = np.array([1, -1, row, -row])
+    distance = np.full(open_cells.size, -1, dtype=np.int32)
+    claimed = np.zeros(open_cells.size, dtype=np.int64)
+    frontier = np.arange(count) * padded[0].size + (starts[:, 1] + 1) * row + starts[:, 0] + 1
+    step = 0
+    while frontier.size:
+        distance[frontier] = step
+        neighbours = (frontier[:, None] + offsets).ravel()
+        neighbours = neighbours[open_cells[neighbours] & (distance[neighbours] < 0)]
+        order = np.arange(neighbours.size)
+        claimed[neighbours] = order
+        frontier = neighbours[claimed[neighbours] == order]
+        step += 1
+    return distance.reshape(padded.shape)[:, 1:-1, 1:-1]
+
+def flow_field(walkable, x, y):
+    # Steps from every walkable cell to (x, y); moving to a neighbour with a smaller value heads there.
+    return distance_fields(walkable[None], np.array([[x, y]]))[0]
+
+def main_components(labels):
+    count = labels.shape[0]
+    roots, sizes = np.unique(labels[labels >= 0], return_counts=True)
+    root_maps = roots // labels[0].size
+    best = np.full(count, -1)
+    order = np.lexsort((-sizes, root_maps))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = root_maps[order][1:] != root_maps[order][:-1]
+    best[root_maps[order][first]] = roots[order][first]
+    return best
+
+def place_exits(grids, rng, eligible):
+    count, grid_height, grid_width = grids.shape
+    scores = rng.random(grids.shape)
+    scores[~eligible] = -2.0
+    window = np.full((grid_height, grid_width), -1.0)
+    window[EXIT_MARGIN:grid_height - EXIT_MARGIN, EXIT_MARGIN:grid_width - EXIT_MARGIN] = 0.0
+    scores += window
+    flat = scores.reshape(count, -1).argmax(axis=1)
+    return np.stack([flat % grid_width, flat // grid_width], axis=1)
+
+def generate_dungeon(grid_width, grid_height, seed=None):
+    grids, exits, distances = generate_dungeons(1, grid_width, grid_height, seed)
+    return grids[0], int(exits[0, 0]), int(exits[0, 1]), distances[0]
+
+class MapFullError(RuntimeError):
+    pass
+
+class FreeCellIndex:
+    # Floor cells are kept in one array with the free ones first; slots[cell] is each cell's
+    # position in it, so sampling and releasing are O(1) swaps. The index only covers spawning:
+    # once a level is built, the occupancy grid tracks where entities are.
+    def __init__(self, grid, rng):
+        self.grid_width = grid.shape[1]
+        self.cells = np.flatnonzero(grid.ravel() == FLOOR)
+        self.slots = np.full(grid.size, -1, dtype=np.int64)
+        self.slots[self.cells] = np.arange(len(self.cells))
+        self.count = len(self.cells)
+        self.rng = rng
+    def __len__(self):
+        return self.count
+    def swap(self, slot, other_slot):
+        cell, other = self.cells[slot], self.cells[other_slot]
+        self.cells[slot], self.cells[other_slot] = other, cell
+        self.slots[other], self.slots[cell] = slot, other_slot
+    def take_slot(self, slot):
+        cell = int(self.cells[slot])
+        self.count -= 1
+        self.swap(slot, self.count)
+        return cell % self.grid_width, cell // self.grid_width
+    def sample(self):
+        if self.count == 0:
+            raise MapFullError("no free cells left on the map")
+        return self.take_slot(self.rng.randrange(self.count))
+    def release(self, x, y):
+        slot = self.slots[y * self.grid_width + x]
+        if slot < self.count:
+            return False
+        self.swap(slot, self.count)
+        self.count += 1
+        return True
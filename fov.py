@@ -0,0 +1,76 @@
+import numpy as np
+
+SIGHT_RADIUS = 6
+
+# (xx, xy, yx, yy) transforms mapping the first octant onto each of the eight.
+OCTANTS = [(1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+           (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1)]
+
+class FieldOfView:
+    # Recursive shadowcasting over a (2r+1)^2 window around the viewer, so the cost and memory of an
+    # update depend on the sight radius, not the map size. `visible` covers the cells rows x columns.
+    def __init__(self, walkable, radius=SIGHT_RADIUS):
+        self.walkable = walkable
+        self.radius = radius
+        size = 2 * radius + 1
+        self.window = np.zeros((size, size), dtype=bool)
+        self.origin = None
+        self.rows = self.columns = slice(0, 0)
+        self.visible = self.window[:0, :0]
+
+    def update(self, x, y):
+        radius = self.radius
+        grid_height, grid_width = self.walkable.shape
+        top, left = y - radius, x - radius
+        self.rows = slice(max(top, 0), min(y + radius + 1, grid_height))
+        self.columns = slice(max(left, 0), min(x + radius + 1, grid_width))
+        local_rows = slice(self.rows.start - top, self.rows.stop - top)
+        local_columns = slice(self.columns.start - left, self.columns.stop - left)
+        opaque = np.ones(self.window.shape, dtype=bool)
+        opaque[local_rows, local_columns] = ~self.walkable[self.rows, self.columns]
+        self.opaque = opaque.tolist()
+        self.lit = [(radius, radius)]
+        for transform in OCTANTS:
+            self.cast(1, 1.0, 0.0, *transform)
+        self.window[:] = False
+        lit_x, lit_y = zip(*self.lit)
+        self.window[list(lit_y), list(lit_x)] = True
+        self.visible = self.window[local_rows, local_columns]
+        self.origin = (x, y)
+
+    def cast(self, row, start, end, xx, xy, yx, yy):
+        if start < end:
+            return
+        radius = self.radius
+        new_start = start
+        for distance in range(row, radius + 1):
+            dx, dy = -distance - 1, -distance
+            blocked = False
+            while dx <= 0:
+                dx += 1
+                x = radius + dx * xx + dy * xy
+                y = radius + dx * yx + dy * yy
+                left_slope = (dx - 0.5) / (dy + 0.5)
+                right_slope = (dx + 0.5) / (dy - 0.5)
+                if start < right_slope:
+                    continue
+                if end > left_slope:
+                    break
+                if dx * dx + dy * dy <= radius * radius:
+                    self.lit.append((x, y))
+                if blocked:
+                    if self.opaque[y][x]:
+                        new_start = right_slope
+                    else:
+                        blocked = False
+                        start = new_start
+                elif self.opaque[y][x] and distance < radius:
+                    blocked = True
+                    self.cast(distance + 1, start, left_slope, xx, xy, yx, yy)
+                    new_start = right_slope
+            if blocked:
+                break
+
+    def is_visible(self, x, y):
+        return self.rows.start <= y < self.rows.stop and self.columns.start <= x < self.columns.stop and \
+            bool(self.visible[y - self.rows.start, x - self.columns.start])
@@ -0,0 +1,90 @@
+import multiprocessing
+import os
+import random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from dungeon import FLOOR, FreeCellIndex, MapFullError, generate_dungeon
+
+LOOKAHEAD = 2
+MAX_ATTEMPTS = 20
+POOL_MIN_CELLS = 100 * 72
+
+Level = namedtuple("Level", "dungeon_map exit_x exit_y exit_distance player enemy_positions territory_radii swarm_seed")
+
+def enemies_for_round(round_number):
+    return 5 if round_number == 1 else min(5 + round_number, 15)
+
+def round_seed(game_seed, round_number):
+    # Each round's layout depends only on the game seed and the round number, so it comes out the
+    # same whether it was built ahead of time in a worker or on the spot.
+    return int(np.random.SeedSequence([game_seed, round_number]).generate_state(1, np.uint64)[0])
+
+def generate_level(grid_width, grid_height, enemy_count, seed):
+    rng = random.Random(seed)
+    for _ in range(MAX_ATTEMPTS):
+        dungeon_map, exit_x, exit_y, exit_distance = generate_dungeon(grid_width, grid_height, rng.getrandbits(64))
+        if np.count_nonzero(dungeon_map == FLOOR) > enemy_count:
+            break
+    else:
+        raise MapFullError(f"no {grid_width}x{grid_height} layout fits {enemy_count} enemies")
+    free_cells = FreeCellIndex(dungeon_map, rng)
+    player = free_cells.sample()
+    enemy_positions = [free_cells.sample() for _ in range(enemy_count)]
+    territory_radii = [rng.randint(2, 4) for _ in range(enemy_count)]
+    return Level(dungeon_map, exit_x, exit_y, exit_distance, player, enemy_positions, territory_radii, rng.getrandbits(64))
+
+def create_level_pool(workers=2):
+    # Workers are forked: spawn and forkserver would re-import the game's main module, which starts
+    # the game. Without fork, levels are generated synchronously.
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork"))
+
+def default_level_pool(grid_width, grid_height, workers=2):
+    # Below POOL_MIN_CELLS a level generates in-process faster than a worker can hand one back, and
+    # forking a process that already runs threads can deadlock, so the pool is only started for big
+    # grids. DUNGEON_LEVEL_WORKERS overrides the worker count either way; 0 turns the pool off.
+    if grid_width * grid_height < POOL_MIN_CELLS:
+        workers = 0
+    workers = int(os.environ.get("DUNGEON_LEVEL_WORKERS", workers))
+    return create_level_pool(workers) if workers > 0 else None
+
+class LevelPipeline:
+    # Keeps the next few rounds' levels generating in a process pool; `take` hands over a finished
+    # one, or generates it on the spot if it is not ready.
+    def __init__(self, executor, lookahead=LOOKAHEAD):
+        self.executor = executor
+        self.lookahead = lookahead
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    def prefetch(self, specs):
+        for spec in list(self.pending):
+            if spec not in specs:
+                self.pending.pop(spec).cancel()
+        if self.executor is None:
+            return
+        for spec in specs:
+            if spec not in self.pending:
+                self.pending[spec] = self.executor.submit(generate_level, *spec)
+
+    def take(self, spec):
+        future = self.pending.pop(spec, None)
+        if future is not None and future.done() and not future.cancelled() and future.exception() is None:
+            self.hits += 1
+            return future.result()
+        if future is not None:
+            future.cancel()
+        self.misses += 1
+        return generate_level(*spec)
+
+    def shutdown(self):
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
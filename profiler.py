@@ -0,0 +1,86 @@
+import json
+import time
+
+import numpy as np
+
+class FrameProfiler:
+    # Per-phase timings for the last `capacity` frames in preallocated ring buffers. Callers check
+    # `enabled` before timing anything, so a disabled profiler costs one attribute test per callback.
+    def __init__(self, phases, capacity=600, enabled=False):
+        self.phases = list(phases) + ["other"]
+        self.columns = {name: column for column, name in enumerate(self.phases)}
+        self.capacity = capacity
+        self.durations = np.zeros((capacity, len(self.phases)))
+        self.starts = np.zeros((capacity, len(self.phases)))
+        self.frame_starts = np.zeros(capacity)
+        self.frame_times = np.zeros(capacity)
+        self.frames = 0
+        self.frame_start = None
+        self.last_end = None
+        self.enabled = enabled
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame_start = None
+
+    def begin_frame(self):
+        # Whatever the previous frame spent outside measured phases (event handling, display flip)
+        # is booked as "other".
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            row = self.frames % self.capacity
+            self.frame_times[row] = now - self.frame_start
+            other = self.columns["other"]
+            self.durations[row, other] = max(self.frame_times[row] - self.durations[row, :other].sum(), 0.0)
+            self.starts[row, other] = self.last_end
+            self.frames += 1
+        row = self.frames % self.capacity
+        self.durations[row] = 0.0
+        self.starts[row] = 0.0
+        self.frame_starts[row] = now
+        self.frame_start = self.last_end = now
+
+    def measure(self, phase, function, *args):
+        if self.frame_start is None:
+            return function(*args)
+        start = time.perf_counter()
+        result = function(*args)
+        end = time.perf_counter()
+        row = self.frames % self.capacity
+        column = self.columns[phase]
+        if self.durations[row, column] == 0.0:
+            self.starts[row, column] = start
+        self.durations[row, column] += end - start
+        self.last_end = end
+        return result
+
+    def recorded(self):
+        count = min(self.frames, self.capacity)
+        return np.arange(self.frames - count, self.frames) % self.capacity
+
+    def recent_frame_times(self, count):
+        return self.frame_times[self.recorded()[-count:]]
+
+    def summary(self):
+        rows = self.recorded()
+        if len(rows) == 0:
+            return 0.0, {}
+        fps = 1.0 / self.frame_times[rows].mean()
+        percentiles = np.percentile(self.durations[rows], [50, 99], axis=0) * 1000
+        return fps, {name: (percentiles[0, column], percentiles[1, column]) for column, name in enumerate(self.phases)}
+
+    def export_trace(self, path):
+        # Chrome trace-event format (chrome://tracing, Perfetto): one complete event per frame and per phase.
+        rows = self.recorded()
+        origin = self.frame_starts[rows[0]] if len(rows) else 0.0
+        events = []
+        for row in rows.tolist():
+            events.append({"name": "frame", "ph": "X", "pid": 0, "tid": 0,
+                           "ts": (self.frame_starts[row] - origin) * 1e6, "dur": self.frame_times[row] * 1e6})
+            for column, name in enumerate(self.phases):
+                if self.durations[row, column] > 0.0:
+                    events.append({"name": name, "ph": "X", "pid": 0, "tid": 1,
+                                   "ts": (self.starts[row, column] - origin) * 1e6, "dur": self.durations[row, column] * 1e6})
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        return len(rows)
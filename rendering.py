@@ -0,0 +1,203 @@
+import collections
+import functools
+import os
+
+import numpy as np
+import pygame
+from pgzero import ptext
+
+BACKGROUND_COLOR = (15, 15, 25)
+FLOOR_COLOR = (50, 50, 60)
+WALL_COLOR = (80, 60, 40)
+EXIT_COLOR = (255, 215, 0)
+EXIT_INNER_COLOR = (255, 255, 100)
+TERRITORY_COLOR = (150, 50, 50)
+
+TILE_COLORS = np.array([FLOOR_COLOR, WALL_COLOR, EXIT_COLOR], dtype=np.uint8)
+
+def render_tile_layer(dungeon_map, cell_size):
+    grid = np.asarray(dungeon_map, dtype=np.uint8)
+    grid_height, grid_width = grid.shape
+    layer = pygame.Surface((grid_width * cell_size, grid_height * cell_size))
+    pixels = TILE_COLORS[grid.T].repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+    pygame.surfarray.blit_array(layer, pixels)
+    for y, x in np.argwhere(grid == 2):
+        layer.fill(EXIT_INNER_COLOR, (x * cell_size + 2, y * cell_size + 2, cell_size - 4, cell_size - 4))
+    if pygame.display.get_surface() is not None:
+        layer = layer.convert()
+    return layer
+
+@functools.lru_cache(maxsize=None)
+def territory_ring_offsets(radius):
+    span = np.arange(-radius, radius + 1)
+    dx, dy = np.meshgrid(span, span)
+    distance_sq = dx * dx + dy * dy
+    ring = (distance_sq <= radius * radius) & (distance_sq >= (radius - 0.5) * (radius - 0.5))
+    return dx[ring], dy[ring]
+
+def territory_border_mask(dungeon_map, territories):
+    grid = np.asarray(dungeon_map)
+    grid_height, grid_width = grid.shape
+    mask = np.zeros(grid.shape, dtype=bool)
+    for (center_x, center_y), radius in territories:
+        dx, dy = territory_ring_offsets(radius)
+        tx = center_x + dx
+        ty = center_y + dy
+        inside = (tx >= 0) & (tx < grid_width) & (ty >= 0) & (ty < grid_height)
+        mask[ty[inside], tx[inside]] = True
+    return mask & (grid == 0)
+
+def render_territory_layer(dungeon_map, territories, cell_size):
+    mask = territory_border_mask(dungeon_map, territories)
+    grid_height, grid_width = mask.shape
+    layer = pygame.Surface((grid_width * cell_size, grid_height * cell_size))
+    for ty, tx in zip(*np.nonzero(mask)):
+        layer.fill(TERRITORY_COLOR, (tx * cell_size + 1, ty * cell_size + 1, cell_size - 2, cell_size - 2))
+    if pygame.display.get_surface() is not None:
+        layer = layer.convert()
+    layer.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+    return layer
+
+def gradient_colors(height, base, span, channel_offsets):
+    intensity = (base + np.arange(height) / height * span).astype(np.int32)
+    return np.stack([intensity + offset for offset in channel_offsets], axis=1).clip(0, 255)
+
+def render_gradient(size, base, span, channel_offsets):
+    width, height = size
+    surface = pygame.Surface(size)
+    colors = gradient_colors(height, base, span, channel_offsets)
+    pygame.surfarray.blit_array(surface, np.broadcast_to(colors, (width, height, 3)))
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    return surface
+
+def draw_text(surface, text, **kwargs):
+    ptext.draw(text, surf=surface, **kwargs)
+
+class BackgroundCache:
+    def __init__(self, builders):
+        self.builders = builders
+        self.surfaces = {}
+    def get(self, state, size):
+        key = (state, size)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = self.builders[state](size)
+        return surface
+    def clear(self):
+        self.surfaces.clear()
+
+class ChunkRenderer:
+    # Pre-rendered chunk surfaces (tiles plus territory borders) for a ChunkedWorld, kept in an LRU
+    # sized from the camera's visible chunk count, so pixel memory follows the viewport rather than
+    # the world size.
+    def __init__(self, cell_size, capacity):
+        self.cell_size = cell_size
+        self.capacity = capacity
+        self.surfaces = collections.OrderedDict()
+    def clear(self):
+        self.surfaces.clear()
+    def invalidate_around(self, chunk_x, chunk_y):
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                self.surfaces.pop((chunk_x + dx, chunk_y + dy), None)
+    def chunk_surface(self, world, swarm, chunk_x, chunk_y):
+        key = (chunk_x, chunk_y)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        rows, columns = world.chunk_slices(chunk_x, chunk_y)
+        region = world.grid[rows, columns]
+        surface = render_tile_layer(region, self.cell_size)
+        radius = swarm.territory_radius
+        near = ((swarm.center_x + radius >= columns.start) & (swarm.center_x - radius < columns.stop)
+                & (swarm.center_y + radius >= rows.start) & (swarm.center_y - radius < rows.stop))
+        territories = [((x - columns.start, y - rows.start), r) for x, y, r in
+                       zip(swarm.center_x[near].tolist(), swarm.center_y[near].tolist(), radius[near].tolist())]
+        if territories:
+            surface.blit(render_territory_layer(region, territories, self.cell_size), (0, 0))
+        self.surfaces[key] = surface
+        while len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+    def draw(self, target, world, swarm, camera):
+        for chunk_x, chunk_y in world.drain_recent():
+            self.invalidate_around(chunk_x, chunk_y)
+        chunk_pixels = world.chunk_size * self.cell_size
+        chunk_columns, chunk_rows = camera.visible_chunks(world.chunk_size)
+        for chunk_y in chunk_rows:
+            for chunk_x in chunk_columns:
+                if 0 <= chunk_x < world.chunks_wide and 0 <= chunk_y < world.chunks_high and world.generated[chunk_y, chunk_x]:
+                    surface = self.chunk_surface(world, swarm, chunk_x, chunk_y)
+                    target.blit(surface, (chunk_x * chunk_pixels - camera.x, chunk_y * chunk_pixels - camera.y))
+
+def surface_bytes(surface):
+    return surface.get_bytesize() * surface.get_width() * surface.get_height()
+
+class TextCache:
+    # Rendered text keyed by (text, fontsize, color), evicting least recently used surfaces once
+    # they exceed `budget` bytes. ptext caches surfaces too, but resolving its option set on every
+    # call costs more than the blit itself.
+    def __init__(self, budget=4 * 2 ** 20):
+        self.budget = budget
+        self.size = 0
+        self.surfaces = collections.OrderedDict()
+    def get(self, text, fontsize, color):
+        key = (text, fontsize, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = self.surfaces[key] = ptext.getsurf(text, fontsize=fontsize, color=color, cache=False)
+        self.size += surface_bytes(surface)
+        while self.size > self.budget and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.size -= surface_bytes(evicted)
+        return surface
+    def draw(self, target, text, pos=None, center=None, fontsize=24, color=(255, 255, 255)):
+        surface = self.get(text, fontsize, color)
+        if center is not None:
+            pos = surface.get_rect(center=center)
+        target.blit(surface, pos)
+
+class HudLabel:
+    # A formatted label that only looks its text up again when the values shown change.
+    def __init__(self, text_cache, template, pos, fontsize, color):
+        self.text_cache = text_cache
+        self.template = template
+        self.pos = pos
+        self.fontsize = fontsize
+        self.color = color
+        self.key = None
+        self.surface = None
+    def draw(self, target, *values, color=None):
+        key = (values, color)
+        if key != self.key:
+            self.key = key
+            self.surface = self.text_cache.get(self.template.format(*values), self.fontsize, color or self.color)
+        target.blit(self.surface, self.pos)
+
+def load_animation_frames(images_dir, animations):
+    return {name: [pygame.image.load(os.path.join(images_dir, f"{name}{index + 1}.png")) for index in range(frame_count)]
+            for name, (frame_count, _) in animations.items()}
+
+class SpriteAtlas:
+    # Every animation frame packed into one surface, one row per animation, with subsurfaces
+    # resolved up front so drawing never looks frames up by name.
+    def __init__(self, frames):
+        frame_width = max(image.get_width() for images in frames.values() for image in images)
+        frame_height = max(image.get_height() for images in frames.values() for image in images)
+        columns = max(len(images) for images in frames.values())
+        self.surface = pygame.Surface((columns * frame_width, len(frames) * frame_height), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+        self.frames = {}
+        for row, (name, images) in enumerate(frames.items()):
+            self.frames[name] = []
+            for column, image in enumerate(images):
+                area = pygame.Rect(column * frame_width, row * frame_height, image.get_width(), image.get_height())
+                self.surface.blit(image, area)
+                self.frames[name].append(self.surface.subsurface(area))
+    def current_frames(self, animation_clock):
+        return {name: self.frames[name][index] for name, index in animation_clock.frames.items()}
@@ -0,0 +1,108 @@
+import os
+import struct
+import sys
+import time
+from collections import namedtuple
+
+from simulation import MOVES, GameSimulation, WorldSimulation
+
+MAGIC = b"DREC"
+VERSION = 3
+HEADER = struct.Struct("<4sBQHBI")
+EVENT = struct.Struct("<IB")
+FOOTER = struct.Struct("<Iiii")
+ACTIONS = list(MOVES) + ["confirm"]
+RELEASE = 0x80
+CHASE_FLAG = 1
+FOG_FLAG = 2
+
+Recording = namedtuple("Recording", "seed world_chunks chase fog events ticks score health round")
+
+def make_simulation(seed, world_chunks=0, levels=None, chase=False, fog=False):
+    if world_chunks:
+        return WorldSimulation(seed, chunks_wide=world_chunks, chunks_high=world_chunks)
+    return GameSimulation(seed, levels=levels, chase=chase, fog=fog)
+
+class InputRecorder:
+    # Stands in for the simulation's key_down/key_up, logging each input with the tick it arrived on.
+    def __init__(self, simulation, world_chunks=0):
+        self.simulation = simulation
+        self.world_chunks = world_chunks
+        self.events = []
+    def key_down(self, action):
+        self.events.append((self.simulation.tick, ACTIONS.index(action)))
+        self.simulation.key_down(action)
+    def key_up(self, action):
+        self.events.append((self.simulation.tick, ACTIONS.index(action) | RELEASE))
+        self.simulation.key_up(action)
+    def recording(self):
+        sim = self.simulation
+        return Recording(sim.seed, self.world_chunks, sim.chase, sim.fog, list(self.events), sim.tick, sim.score, sim.player.health, sim.current_round)
+    def save(self, path):
+        save(self.recording(), path)
+
+def save(recording, path):
+    # Header (magic, version, seed, world chunks, mode flags, event count), 5 bytes per event, then the final tick and results.
+    flags = (CHASE_FLAG if recording.chase else 0) | (FOG_FLAG if recording.fog else 0)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, recording.seed, recording.world_chunks, flags, len(recording.events)))
+        file.write(b"".join(EVENT.pack(tick, code) for tick, code in recording.events))
+        file.write(FOOTER.pack(recording.ticks, recording.score, recording.health, recording.round))
+
+def load(path):
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version, seed, world_chunks, flags, event_count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} recording")
+    events = list(EVENT.iter_unpack(data[HEADER.size:HEADER.size + event_count * EVENT.size]))
+    ticks, score, health, round_number = FOOTER.unpack_from(data, HEADER.size + event_count * EVENT.size)
+    return Recording(seed, world_chunks, bool(flags & CHASE_FLAG), bool(flags & FOG_FLAG), events, ticks, score, health, round_number)
+
+def replay(recording):
+    sim = make_simulation(recording.seed, recording.world_chunks, chase=recording.chase, fog=recording.fog)
+    for tick, code in recording.events:
+        while sim.tick < tick:
+            sim.step()
+        action = ACTIONS[code & ~RELEASE]
+        if code & RELEASE:
+            sim.key_up(action)
+        else:
+            sim.key_down(action)
+        sim.drain_events()
+    while sim.tick < recording.ticks:
+        sim.step()
+    return sim
+
+def verify(recording):
+    sim = replay(recording)
+    expected = (recording.score, recording.health, recording.round)
+    actual = (sim.score, sim.player.health, sim.current_round)
+    return expected == actual, expected, actual
+
+def recording_paths(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".drec"))
+        else:
+            yield path
+
+def main(paths):
+    failures = 0
+    total_ticks = 0
+    start = time.perf_counter()
+    for path in recording_paths(paths):
+        recording = load(path)
+        matched, expected, actual = verify(recording)
+        total_ticks += recording.ticks
+        if not matched:
+            failures += 1
+            print(f"MISMATCH {path}: expected score/health/round {expected}, got {actual}")
+        else:
+            print(f"ok       {path}: {recording.ticks} ticks, score {actual[0]}, health {actual[1]}, round {actual[2]}")
+    elapsed = time.perf_counter() - start
+    print(f"{total_ticks} ticks replayed in {elapsed:.2f} s, {failures} mismatches")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,485 @@
+import math
+import random
+
+import numpy as np
+
+from dungeon import FLOOR, WALL, EXIT, flow_field
+from fov import FieldOfView
+from levels import enemies_for_round, generate_level, round_seed
+from world import CHUNK_SIZE, ChunkedWorld
+
+CELL_SIZE = 32
+GRID_WIDTH = 800 // CELL_SIZE
+GRID_HEIGHT = 600 // CELL_SIZE
+FIXED_DT = 1 / 60
+MAX_FRAME_TIME = 0.25
+EXPLORE_POINTS = 10
+CHASE_DELAY = 0.3
+
+MOVES = {
+    "up": (0, -1),
+    "down": (0, 1),
+    "left": (-1, 0),
+    "right": (1, 0)
+}
+MOVE_PRIORITY = ("up", "down", "left", "right")
+EMPTY = -1
+
+class OccupancyGrid:
+    def __init__(self, grid_width, grid_height):
+        self.cells = np.full((grid_height, grid_width), EMPTY, dtype=np.int32)
+    def occupant(self, x, y):
+        return int(self.cells[y, x])
+
+ANIMATIONS = {
+    "player_idle": (6, 0.5),
+    "player_walk": (8, 0.15),
+    "enemy_idle": (6, 0.5),
+    "enemy_walk": (8, 0.15)
+}
+
+class AnimationClock:
+    # One clock for every character: frame indices are derived from the shared time when drawn, not per tick.
+    def __init__(self, animations):
+        self.animations = animations
+        self.time = 0.0
+    def update(self, dt):
+        self.time += dt
+    @property
+    def frames(self):
+        return {name: int(self.time / frame_duration) % frame_count for name, (frame_count, frame_duration) in self.animations.items()}
+
+class Character:
+    def __init__(self, simulation, x, y, sprite):
+        self.simulation = simulation
+        self.sprite = sprite
+        self.grid_x = x
+        self.grid_y = y
+        self.pixel_x = x * CELL_SIZE
+        self.pixel_y = y * CELL_SIZE
+        self.target_x = self.pixel_x
+        self.target_y = self.pixel_y
+        self.moving = False
+        self.move_speed = 120
+    def update(self, dt):
+        if self.moving:
+            dx = self.target_x - self.pixel_x
+            dy = self.target_y - self.pixel_y
+            distance = math.sqrt(dx * dx + dy * dy)
+            if distance < 2:
+                self.pixel_x = self.target_x
+                self.pixel_y = self.target_y
+                self.moving = False
+            else:
+                move_distance = self.move_speed * dt
+                self.pixel_x += (dx / distance) * move_distance
+                self.pixel_y += (dy / distance) * move_distance
+    def move_to(self, grid_x, grid_y):
+        if not self.moving and self.is_valid_position(grid_x, grid_y):
+            self.grid_x = grid_x
+            self.grid_y = grid_y
+            self.target_x = grid_x * CELL_SIZE
+            self.target_y = grid_y * CELL_SIZE
+            self.moving = True
+            return True
+        return False
+    def is_valid_position(self, x, y):
+        return self.simulation.is_walkable(x, y)
+    @property
+    def animation(self):
+        return self.sprite + ("_walk" if self.moving else "_idle")
+
+class Player(Character):
+    def __init__(self, simulation, x, y):
+        super().__init__(simulation, x, y, "player")
+        self.health = 100
+
+DIRECTIONS = np.array([(0, 1), (0, -1), (1, 0), (-1, 0)])
+
+class EnemySwarm:
+    # Struct-of-arrays enemy state: every per-enemy field is a NumPy array indexed by entity id.
+    def __init__(self, positions, territory_radii, occupancy, walkable, rng):
+        self.count = 0
+        self.occupancy = occupancy
+        self.walkable = walkable
+        self.rng = rng
+        self.grid_x = np.zeros(0, dtype=np.int64)
+        self.grid_y = np.zeros(0, dtype=np.int64)
+        self.from_x = np.zeros(0, dtype=np.int64)
+        self.from_y = np.zeros(0, dtype=np.int64)
+        self.moving = np.zeros(0, dtype=bool)
+        self.move_speed = 120
+        self.clock = 0.0
+        self.move_start = np.zeros(0)
+        self.arrive_time = np.zeros(0)
+        self.next_move_time = np.zeros(0)
+        self.next_due = math.inf
+        self.center_x = np.zeros(0, dtype=np.int64)
+        self.center_y = np.zeros(0, dtype=np.int64)
+        self.territory_radius = np.zeros(0, dtype=np.int64)
+        self.flow = None
+        self.player_x = self.player_y = None
+        self.views = []
+        self.add(positions, territory_radii)
+
+    def add(self, positions, territory_radii):
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        count = len(positions)
+        grid_x, grid_y = positions[:, 0], positions[:, 1]
+        next_move_time = self.clock + self.rng.uniform(1.0, 3.0, count)
+        added = {
+            "grid_x": grid_x, "grid_y": grid_y,
+            "from_x": grid_x, "from_y": grid_y,
+            "moving": np.zeros(count, dtype=bool),
+            "move_start": np.zeros(count),
+            "arrive_time": np.full(count, np.inf),
+            "next_move_time": next_move_time,
+            "center_x": grid_x, "center_y": grid_y,
+            "territory_radius": np.asarray(territory_radii, dtype=np.int64)
+        }
+        for name, values in added.items():
+            setattr(self, name, np.concatenate([getattr(self, name), values]))
+        entity_ids = np.arange(self.count, self.count + count)
+        self.occupancy.cells[grid_y, grid_x] = entity_ids
+        self.views.extend(EnemyView(self, index) for index in entity_ids.tolist())
+        self.count += count
+        self.next_due = min(self.next_due, float(next_move_time.min(initial=np.inf)))
+
+    def update(self, dt):
+        # Moves are straight lines at a constant speed, so each enemy only stores when its current move
+        # ends or its next move is due, and a tick does no work until the earliest of those has passed.
+        self.clock += dt
+        if self.next_due > self.clock:
+            return
+        done = np.flatnonzero(self.arrive_time <= self.clock)
+        if done.size:
+            self.moving[done] = False
+            self.arrive_time[done] = np.inf
+            self.next_move_time[done] = self.clock + self.rng.uniform(1.0, 3.0, done.size)
+            if self.flow is not None:
+                hunters = done[self.chasing(done)]
+                self.next_move_time[hunters] = self.clock + CHASE_DELAY
+        due = np.flatnonzero(self.next_move_time <= self.clock)
+        if due.size:
+            self.next_move_time[due] = self.clock + self.rng.uniform(1.0, 3.0, due.size)
+            self.try_random_moves(due)
+        self.next_due = float(min(self.next_move_time.min(initial=np.inf), self.arrive_time.min(initial=np.inf)))
+
+    def pixel_position(self, index):
+        grid_x, grid_y = self.grid_x[index], self.grid_y[index]
+        if not self.moving[index]:
+            return float(grid_x * CELL_SIZE), float(grid_y * CELL_SIZE)
+        progress = (self.clock - self.move_start[index]) / (self.arrive_time[index] - self.move_start[index])
+        from_x, from_y = self.from_x[index], self.from_y[index]
+        return float((from_x + (grid_x - from_x) * progress) * CELL_SIZE), float((from_y + (grid_y - from_y) * progress) * CELL_SIZE)
+
+    def chasing(self, index):
+        dx = self.player_x - self.center_x[index]
+        dy = self.player_y - self.center_y[index]
+        return dx * dx + dy * dy <= self.territory_radius[index] ** 2
+
+    def chase(self, flow, player_x, player_y):
+        # Enemies whose territory holds the player step down the shared flow field instead of wandering.
+        self.flow = flow
+        self.player_x, self.player_y = player_x, player_y
+        idle = np.flatnonzero(~self.moving)
+        hunters = idle[self.chasing(idle)]
+        self.next_move_time[hunters] = np.minimum(self.next_move_time[hunters], self.clock + CHASE_DELAY)
+        self.next_due = min(self.next_due, float(self.next_move_time[hunters].min(initial=np.inf)))
+
+    def try_random_moves(self, movers):
+        order = self.rng.permuted(np.tile(np.arange(4), (movers.size, 1)), axis=1)
+        new_x = self.grid_x[movers, None] + DIRECTIONS[order, 0]
+        new_y = self.grid_y[movers, None] + DIRECTIONS[order, 1]
+        radius = self.territory_radius[movers, None]
+        in_territory = (new_x - self.center_x[movers, None]) ** 2 + (new_y - self.center_y[movers, None]) ** 2 <= radius * radius
+        grid_height, grid_width = self.walkable.shape
+        in_bounds = (new_x >= 0) & (new_x < grid_width) & (new_y >= 0) & (new_y < grid_height)
+        safe_x = np.clip(new_x, 0, grid_width - 1)
+        safe_y = np.clip(new_y, 0, grid_height - 1)
+        valid = in_territory & in_bounds & self.walkable[safe_y, safe_x] & (self.occupancy.cells[safe_y, safe_x] == EMPTY)
+        choice = valid.argmax(axis=1)
+        if self.flow is not None:
+            downhill = valid & (self.flow[safe_y, safe_x] >= 0) & (self.flow[safe_y, safe_x] < self.flow[self.grid_y[movers], self.grid_x[movers], None])
+            steps = np.where(downhill, self.flow[safe_y, safe_x], np.iinfo(np.int32).max)
+            hunters = self.chasing(movers)
+            choice = np.where(hunters, steps.argmin(axis=1), choice)
+            valid = np.where(hunters[:, None], downhill, valid)
+        rows = np.arange(movers.size)
+        can_move = valid[rows, choice]
+        movers, choice, rows = movers[can_move], choice[can_move], rows[can_move]
+        target_x = new_x[rows, choice]
+        target_y = new_y[rows, choice]
+        # Two movers picking the same free cell: the lower entity id claims it, as it would moving first.
+        _, first = np.unique(target_y * grid_width + target_x, return_index=True)
+        movers, target_x, target_y = movers[first], target_x[first], target_y[first]
+        self.occupancy.cells[self.grid_y[movers], self.grid_x[movers]] = EMPTY
+        self.occupancy.cells[target_y, target_x] = movers
+        self.from_x[movers] = self.grid_x[movers]
+        self.from_y[movers] = self.grid_y[movers]
+        self.grid_x[movers] = target_x
+        self.grid_y[movers] = target_y
+        self.moving[movers] = True
+        self.move_start[movers] = self.clock
+        self.arrive_time[movers] = self.clock + CELL_SIZE / self.move_speed
+        self.next_move_time[movers] = np.inf
+
+class EnemyView:
+    __slots__ = ("swarm", "index")
+    def __init__(self, swarm, index):
+        self.swarm = swarm
+        self.index = index
+    @property
+    def grid_x(self):
+        return int(self.swarm.grid_x[self.index])
+    @property
+    def grid_y(self):
+        return int(self.swarm.grid_y[self.index])
+    @property
+    def pixel_x(self):
+        return self.swarm.pixel_position(self.index)[0]
+    @property
+    def pixel_y(self):
+        return self.swarm.pixel_position(self.index)[1]
+    @property
+    def moving(self):
+        return bool(self.swarm.moving[self.index])
+    @property
+    def territory_center(self):
+        return int(self.swarm.center_x[self.index]), int(self.swarm.center_y[self.index])
+    @property
+    def territory_radius(self):
+        return int(self.swarm.territory_radius[self.index])
+    @property
+    def animation(self):
+        return "enemy_walk" if self.swarm.moving[self.index] else "enemy_idle"
+
+class GameSimulation:
+    def __init__(self, seed=None, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT, fixed_dt=FIXED_DT, levels=None, chase=False, fog=False):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.levels = levels
+        self.chase = chase
+        self.fog = fog
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.fixed_dt = fixed_dt
+        self.accumulator = 0.0
+        self.tick = 0
+        self.events = []
+        self.held = set()
+        self.animation_clock = AnimationClock(ANIMATIONS)
+        self.start_game()
+
+    def start_game(self):
+        self.state = "playing"
+        self.score = 0
+        self.current_round = 1
+        self.enemies_per_round = enemies_for_round(1)
+        self.game_seed = self.rng.getrandbits(64)
+        self.build_round()
+
+    def start_new_round(self):
+        self.current_round += 1
+        self.enemies_per_round = enemies_for_round(self.current_round)
+        self.build_round()
+        self.events.append("click")
+        self.state = "playing"
+
+    def build_round(self):
+        self.exit_found = False
+        self.game_won = False
+        spec = self.level_spec(self.current_round, self.enemies_per_round)
+        level = self.levels.take(spec) if self.levels is not None else generate_level(*spec)
+        self.dungeon_map, self.exit_x, self.exit_y, self.exit_distance = level.dungeon_map, level.exit_x, level.exit_y, level.exit_distance
+        player_x, player_y = level.player
+        self.player = Player(self, player_x, player_y)
+        self.occupancy = OccupancyGrid(self.grid_width, self.grid_height)
+        self.walkable = self.dungeon_map != WALL
+        self.start_exploring()
+        self.swarm = EnemySwarm(level.enemy_positions, level.territory_radii, self.occupancy, self.walkable, np.random.default_rng(level.swarm_seed))
+        self.enemies = self.swarm.views
+        self.flow_target = None
+        if self.levels is not None:
+            upcoming = range(self.current_round + 1, self.current_round + self.levels.lookahead + 1)
+            self.levels.prefetch([self.level_spec(round_number, enemies_for_round(round_number)) for round_number in upcoming])
+        self.events.append("new_map")
+
+    def start_exploring(self):
+        # Explored cells live in a bool grid: without fog, the cells the player has stood on; with
+        # fog, every cell the player has seen. Newly seen cells are queued in `revealed` for drawing.
+        self.explored = np.zeros((self.grid_height, self.grid_width), dtype=bool)
+        self.revealed = []
+        if self.fog:
+            self.field_of_view = FieldOfView(self.walkable)
+            self.look()
+        else:
+            self.explored[self.player.grid_y, self.player.grid_x] = True
+
+    def look(self):
+        # Returns how many floor cells came into view for the first time.
+        field_of_view = self.field_of_view
+        field_of_view.update(self.player.grid_x, self.player.grid_y)
+        rows, columns = field_of_view.rows, field_of_view.columns
+        explored = self.explored[rows, columns]
+        new = field_of_view.visible & ~explored
+        explored |= new
+        ys, xs = np.nonzero(new)
+        self.revealed.append((xs + columns.start, ys + rows.start))
+        return int(np.count_nonzero(new & (self.dungeon_map[rows, columns] == FLOOR)))
+
+    def drain_revealed(self):
+        revealed = self.revealed
+        self.revealed = []
+        return revealed
+
+    def is_visible(self, x, y):
+        return not self.fog or self.field_of_view.is_visible(x, y)
+
+    def level_spec(self, round_number, enemy_count):
+        return self.grid_width, self.grid_height, enemy_count, round_seed(self.game_seed, round_number)
+
+    def is_walkable(self, x, y):
+        return 0 <= x < self.grid_width and 0 <= y < self.grid_height and self.dungeon_map[y, x] != WALL
+
+    @property
+    def game_over(self):
+        return self.player.health <= 0
+
+    def key_down(self, action):
+        if self.state == "playing" and not self.game_over:
+            if action in MOVES:
+                self.held.add(action)
+                self.try_move(action)
+        elif self.state == "playing" and action == "confirm":
+            self.start_game()
+        elif self.state == "round_complete" and action == "confirm":
+            self.start_new_round()
+
+    def key_up(self, action):
+        self.held.discard(action)
+
+    def try_move(self, action):
+        if self.player.moving:
+            return False
+        dx, dy = MOVES[action]
+        if self.player.move_to(self.player.grid_x + dx, self.player.grid_y + dy):
+            self.events.append("step")
+            return True
+        return False
+
+    def step(self):
+        dt = self.fixed_dt
+        self.tick += 1
+        if self.state != "playing":
+            return
+        self.animation_clock.update(dt)
+        player = self.player
+        player.update(dt)
+        if not player.moving and self.held and not self.game_over:
+            for action in MOVE_PRIORITY:
+                if action in self.held:
+                    self.try_move(action)
+                    break
+        cell_type = self.dungeon_map[player.grid_y, player.grid_x]
+        if not player.moving and cell_type == EXIT and not self.game_won:
+            self.exit_found = True
+            self.game_won = True
+            self.state = "round_complete"
+            self.score += 100
+            self.events.append("click")
+        if self.fog and (player.grid_x, player.grid_y) != self.field_of_view.origin:
+            self.score += EXPLORE_POINTS * self.look()
+        elif not self.fog and not player.moving and not self.explored[player.grid_y, player.grid_x]:
+            self.explored[player.grid_y, player.grid_x] = True
+            if cell_type == FLOOR:
+                self.score += EXPLORE_POINTS
+        if self.chase and (player.grid_x, player.grid_y) != self.flow_target:
+            self.flow_target = (player.grid_x, player.grid_y)
+            self.swarm.chase(flow_field(self.walkable, player.grid_x, player.grid_y), player.grid_x, player.grid_y)
+        self.swarm.update(dt)
+        if not player.moving:
+            occupant = self.occupancy.occupant(player.grid_x, player.grid_y)
+            if occupant != EMPTY and not self.swarm.moving[occupant]:
+                player.health -= 10
+                self.events.append("hit")
+
+    def advance(self, dt):
+        self.accumulator += min(dt, MAX_FRAME_TIME)
+        steps = 0
+        while self.accumulator >= self.fixed_dt:
+            self.accumulator -= self.fixed_dt
+            self.step()
+            steps += 1
+        return steps
+
+    def run(self, inputs=(), duration=None, ticks=None):
+        script = sorted(inputs, key=lambda entry: entry[0])
+        if ticks is None:
+            ticks = round(duration / self.fixed_dt)
+        index = 0
+        for _ in range(ticks):
+            while index < len(script) and script[index][0] <= self.tick * self.fixed_dt:
+                _, kind, action = script[index]
+                if kind == "down":
+                    self.key_down(action)
+                else:
+                    self.key_up(action)
+                index += 1
+            self.step()
+            if self.events:
+                self.drain_events()
+        return self
+
+    def drain_events(self):
+        events = self.events
+        self.events = []
+        return events
+
+class WorldSimulation(GameSimulation):
+    # A GameSimulation over a ChunkedWorld: chunks and their enemies appear as the player nears them.
+    def __init__(self, seed=None, chunks_wide=50, chunks_high=50, chunk_size=CHUNK_SIZE, enemies_per_chunk=2, fixed_dt=FIXED_DT):
+        self.chunks_wide = chunks_wide
+        self.chunks_high = chunks_high
+        self.chunk_size = chunk_size
+        self.enemies_per_chunk = enemies_per_chunk
+        super().__init__(seed, chunks_wide * chunk_size, chunks_high * chunk_size, fixed_dt)
+
+    def build_round(self):
+        self.exit_found = False
+        self.game_won = False
+        self.world = ChunkedWorld(self.chunks_wide, self.chunks_high, self.rng.getrandbits(64), self.chunk_size)
+        self.dungeon_map = self.world.grid
+        self.walkable = self.world.walkable
+        self.exit_x, self.exit_y = self.world.exit_x, self.world.exit_y
+        self.exit_distance = None
+        self.occupancy = OccupancyGrid(self.grid_width, self.grid_height)
+        self.swarm = EnemySwarm([], [], self.occupancy, self.walkable, np.random.default_rng(self.rng.getrandbits(64)))
+        self.enemies = self.swarm.views
+        player_x, player_y = self.world.chunk_center(*self.world.start_chunk)
+        self.player = Player(self, player_x, player_y)
+        self.start_exploring()
+        self.loaded_from = None
+        self.load_chunks()
+        self.events.append("new_map")
+
+    def load_chunks(self):
+        chunk = self.world.chunk_of(self.player.grid_x, self.player.grid_y)
+        if chunk == self.loaded_from:
+            return
+        self.loaded_from = chunk
+        for chunk_x, chunk_y in self.world.load_around(self.player.grid_x, self.player.grid_y):
+            if (chunk_x, chunk_y) != self.world.start_chunk:
+                self.spawn_chunk_enemies(chunk_x, chunk_y)
+
+    def spawn_chunk_enemies(self, chunk_x, chunk_y):
+        rows, columns = self.world.chunk_slices(chunk_x, chunk_y)
+        free = np.flatnonzero((self.dungeon_map[rows, columns] == FLOOR) & (self.occupancy.cells[rows, columns] == EMPTY))
+        picks = free[self.rng.sample(range(len(free)), min(self.enemies_per_chunk, len(free)))]
+        positions = np.stack([picks % self.chunk_size + columns.start, picks // self.chunk_size + rows.start], axis=1)
+        territory_radii = [self.rng.randint(2, 4) for _ in range(len(picks))]
+        self.swarm.add(positions, territory_radii)
+
+    def step(self):
+        super().step()
+        self.load_chunks()
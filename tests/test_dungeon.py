@@ -0,0 +1,53 @@
+from collections import deque
+
+import numpy as np
+
+from dungeon import carve_floor, label_components
+
+def flood_fill_components(walkable):
+    grid_height, grid_width = walkable.shape
+    components = np.full(walkable.shape, -1)
+    count = 0
+    for y, x in zip(*np.nonzero(walkable)):
+        if components[y, x] >= 0:
+            continue
+        components[y, x] = count
+        queue = deque([(x, y)])
+        while queue:
+            cx, cy = queue.popleft()
+            for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+                if 0 <= nx < grid_width and 0 <= ny < grid_height and walkable[ny, nx] and components[ny, nx] < 0:
+                    components[ny, nx] = count
+                    queue.append((nx, ny))
+        count += 1
+    return components
+
+def assert_same_partition(labels, walkable):
+    expected = flood_fill_components(walkable)
+    assert (labels[~walkable] == -1).all()
+    floor = walkable.ravel()
+    pairs = set(zip(labels.ravel()[floor].tolist(), expected.ravel()[floor].tolist()))
+    assert len(pairs) == len({label for label, _ in pairs}) == len({component for _, component in pairs})
+
+def test_label_components_serpentine():
+    # A single corridor that winds back on itself needs several merge rounds to reach one label.
+    walkable = np.zeros((9, 9), dtype=bool)
+    walkable[::2, :] = True
+    walkable[1::4, -1] = True
+    walkable[3::4, 0] = True
+    walkable[4, 4] = False
+    labels = label_components(walkable)
+    assert_same_partition(labels, walkable)
+    assert len(np.unique(labels[walkable])) == 2
+
+def test_label_components_random_grids():
+    rng = np.random.default_rng(6)
+    for _ in range(20):
+        walkable = rng.random((17, 23)) < 0.55
+        assert_same_partition(label_components(walkable), walkable)
+
+def test_label_components_batch_matches_single_maps():
+    walkable = carve_floor(4, 40, 30, np.random.default_rng(3))
+    labels = label_components(walkable)
+    for index in range(len(walkable)):
+        assert_same_partition(labels[index], walkable[index])
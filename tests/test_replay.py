@@ -0,0 +1,40 @@
+import random
+
+from replay import InputRecorder, load, make_simulation, save, verify
+from simulation import MOVES
+
+def record_session(seed, seconds, chase=False, fog=False):
+    sim = make_simulation(seed, chase=chase, fog=fog)
+    recorder = InputRecorder(sim)
+    rng = random.Random(seed)
+    action = None
+    for tick in range(round(seconds / sim.fixed_dt)):
+        if tick % 18 == 0:
+            if action is not None:
+                recorder.key_up(action)
+            action = rng.choice(list(MOVES))
+            recorder.key_down(action)
+        sim.step()
+        sim.drain_events()
+    return recorder.recording()
+
+def test_save_load_round_trip(tmp_path):
+    recording = record_session(3, 5, chase=True, fog=True)
+    path = tmp_path / "session.drec"
+    save(recording, path)
+    loaded = load(path)
+    assert loaded == recording
+    assert loaded.chase and loaded.fog
+
+def test_save_load_keeps_mode_flags(tmp_path):
+    for chase, fog in [(False, False), (True, False), (False, True)]:
+        recording = record_session(4, 1, chase=chase, fog=fog)
+        path = tmp_path / f"{chase}-{fog}.drec"
+        save(recording, path)
+        assert load(path) == recording
+
+def test_verify_chase_fog_session():
+    recording = record_session(5, 20, chase=True, fog=True)
+    assert recording.events and recording.score > 0
+    matched, expected, actual = verify(recording)
+    assert matched, (expected, actual)
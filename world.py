@@ -0,0 +1,97 @@
+import math
+
+import numpy as np
+
+from dungeon import EXIT, WALL, generate_chunk
+
+CHUNK_SIZE = 20
+LOAD_RADIUS = 2
+
+class ChunkedWorld:
+    # Terrain for a large world, generated one chunk at a time from (seed, chunk) so any chunk can be
+    # produced in any order. Cells of chunks that have not been generated yet read as wall.
+    def __init__(self, chunks_wide, chunks_high, seed, chunk_size=CHUNK_SIZE):
+        self.chunks_wide = chunks_wide
+        self.chunks_high = chunks_high
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.grid_width = chunks_wide * chunk_size
+        self.grid_height = chunks_high * chunk_size
+        self.grid = np.full((self.grid_height, self.grid_width), WALL, dtype=np.uint8)
+        self.walkable = np.zeros((self.grid_height, self.grid_width), dtype=bool)
+        self.generated = np.zeros((chunks_high, chunks_wide), dtype=bool)
+        self.recent = []
+        rng = np.random.default_rng(seed)
+        self.start_chunk = (chunks_wide // 2, chunks_high // 2)
+        self.exit_chunk = self.start_chunk
+        while self.exit_chunk == self.start_chunk and chunks_wide * chunks_high > 1:
+            self.exit_chunk = (int(rng.integers(chunks_wide)), int(rng.integers(chunks_high)))
+        self.exit_x, self.exit_y = self.chunk_center(*self.exit_chunk)
+
+    def chunk_center(self, chunk_x, chunk_y):
+        return chunk_x * self.chunk_size + self.chunk_size // 2, chunk_y * self.chunk_size + self.chunk_size // 2
+
+    def chunk_of(self, x, y):
+        return x // self.chunk_size, y // self.chunk_size
+
+    def chunk_slices(self, chunk_x, chunk_y):
+        size = self.chunk_size
+        return slice(chunk_y * size, (chunk_y + 1) * size), slice(chunk_x * size, (chunk_x + 1) * size)
+
+    def chunk_seed(self, chunk_x, chunk_y):
+        return np.random.SeedSequence([self.seed, chunk_x, chunk_y])
+
+    def generate(self, chunk_x, chunk_y):
+        rows, columns = self.chunk_slices(chunk_x, chunk_y)
+        chunk = generate_chunk(self.chunk_size, self.chunk_seed(chunk_x, chunk_y))
+        if (chunk_x, chunk_y) == self.exit_chunk:
+            chunk[self.chunk_size // 2, self.chunk_size // 2] = EXIT
+        self.grid[rows, columns] = chunk
+        self.walkable[rows, columns] = chunk != WALL
+        self.generated[chunk_y, chunk_x] = True
+        self.recent.append((chunk_x, chunk_y))
+
+    def load_around(self, x, y, radius=LOAD_RADIUS):
+        chunk_x, chunk_y = self.chunk_of(x, y)
+        loaded = []
+        for cy in range(max(0, chunk_y - radius), min(self.chunks_high, chunk_y + radius + 1)):
+            for cx in range(max(0, chunk_x - radius), min(self.chunks_wide, chunk_x + radius + 1)):
+                if not self.generated[cy, cx]:
+                    self.generate(cx, cy)
+                    loaded.append((cx, cy))
+        return loaded
+
+    def drain_recent(self):
+        recent = self.recent
+        self.recent = []
+        return recent
+
+class Camera:
+    def __init__(self, viewport_width, viewport_height, cell_size):
+        self.viewport_width = viewport_width
+        self.viewport_height = viewport_height
+        self.cell_size = cell_size
+        self.x = 0
+        self.y = 0
+
+    def follow(self, pixel_x, pixel_y, grid_width, grid_height):
+        world_width = grid_width * self.cell_size
+        world_height = grid_height * self.cell_size
+        self.x = int(min(max(pixel_x + self.cell_size / 2 - self.viewport_width / 2, 0), max(world_width - self.viewport_width, 0)))
+        self.y = int(min(max(pixel_y + self.cell_size / 2 - self.viewport_height / 2, 0), max(world_height - self.viewport_height, 0)))
+
+    def visible_cells(self, margin=0):
+        first_x = self.x // self.cell_size - margin
+        first_y = self.y // self.cell_size - margin
+        last_x = math.ceil((self.x + self.viewport_width) / self.cell_size) + margin
+        last_y = math.ceil((self.y + self.viewport_height) / self.cell_size) + margin
+        return first_x, first_y, last_x, last_y
+
+    def visible_chunks(self, chunk_size):
+        first_x, first_y, last_x, last_y = self.visible_cells()
+        return range(first_x // chunk_size, (last_x - 1) // chunk_size + 1), range(first_y // chunk_size, (last_y - 1) // chunk_size + 1)
+
+    def max_visible_chunks(self, chunk_size):
+        # An unaligned viewport straddles one chunk more than it spans on each axis.
+        chunk_pixels = chunk_size * self.cell_size
+        return (math.ceil(self.viewport_width / chunk_pixels) + 1) * (math.ceil(self.viewport_height / chunk_pixels) + 1)